@@ -6,6 +6,12 @@ Binary Search
 """
 
 import unittest
+import math
+import mmap
+import os
+import tempfile
+import time
+from array import array
 from random import randrange
 
 
@@ -152,6 +158,927 @@ def binary_search_upper_bound(array, x):
     return ub - 1
 
 
+def _bisect_between(array, target, lb, ub, upper):
+    """
+    Binary search in the open range (lb, ub) of given array, where
+    array[lb] is known to go before target and array[ub] not
+
+    :param array: given array
+    :type array: list
+    :param target: target element to search
+    :type target: Any
+    :param lb: index of lower bound, -1 for none
+    :type lb: int
+    :param ub: index of upper bound, len(array) for none
+    :type ub: int
+    :param upper: whether elements equal to target go before it
+    :type upper: bool
+    :return: min(index) where array[index] does not go before target
+    :rtype: int
+    """
+    while lb + 1 < ub:
+        mid = lb + (ub - lb) // 2
+        if target > array[mid] or (upper and target == array[mid]):
+            lb = mid
+        else:
+            ub = mid
+    return ub
+
+
+def exponential_search(array, target, hint=0, upper=False):
+    """
+    Search target element in the given array by galloping from a hint
+    position, then binary searching in the last bracket
+
+    The step doubles as long as the target is not bracketed, so the number
+    of probes is O(log d) where d is the distance between the hint and the
+    result. It suits cursors moving forward through sorted data.
+
+    - Worst-case space complexity: O(1)
+    - Worst-case performance: O(log d)
+
+    :param array: given array
+    :type array: list
+    :param target: target element to search
+    :type target: Any
+    :param hint: index to start galloping from
+    :type hint: int
+    :param upper: return the upper bound instead of the lower bound
+    :type upper: bool
+    :return: index as `binary_search_lower_bound` (or
+             `binary_search_upper_bound` if upper)
+    :rtype: int
+    """
+    # check base case
+    if len(array) == 0:
+        return -1
+    hint = min(max(hint, 0), len(array) - 1)
+    if target > array[hint] or (upper and target == array[hint]):
+        # gallop to the right
+        lb = hint
+        step = 1
+        while lb + step < len(array) and (target > array[lb + step] or (
+                upper and target == array[lb + step])):
+            lb += step
+            step *= 2
+        ub = min(lb + step, len(array))
+    else:
+        # gallop to the left
+        ub = hint
+        step = 1
+        while ub - step >= 0 and not (target > array[ub - step] or (
+                upper and target == array[ub - step])):
+            ub -= step
+            step *= 2
+        lb = max(ub - step, -1)
+    idx = _bisect_between(array, target, lb, ub, upper)
+    return idx - 1 if upper else idx
+
+
+def interpolation_search(array, target, upper=False):
+    """
+    Search target element in the given array of numeric keys by
+    interpolation search
+
+    Instead of the midpoint, each probe is placed where the target would
+    be if the keys in the current range were linearly distributed.
+
+    - Worst-case space complexity: O(1)
+    - Average performance: O(log log n) for uniformly distributed keys
+    - Worst-case performance: O(n)
+
+    :param array: given array of numbers
+    :type array: list[int] or list[float]
+    :param target: target element to search
+    :type target: int or float
+    :param upper: return the upper bound instead of the lower bound
+    :type upper: bool
+    :return: index as `binary_search_lower_bound` (or
+             `binary_search_upper_bound` if upper)
+    :rtype: int
+    """
+    # check base case
+    if len(array) == 0:
+        return -1
+    # array[lb] goes before target and array[ub] does not
+    lb = 0
+    ub = len(array) - 1
+    if not (target > array[lb] or (upper and target == array[lb])):
+        idx = 0
+    elif target > array[ub] or (upper and target == array[ub]):
+        idx = len(array)
+    else:
+        while lb + 1 < ub:
+            mid = lb + int((target - array[lb]) * (ub - lb) / (array[ub] - array[lb]))
+            mid = min(max(mid, lb + 1), ub - 1)
+            if target > array[mid] or (upper and target == array[mid]):
+                lb = mid
+            else:
+                ub = mid
+        idx = ub
+    return idx - 1 if upper else idx
+
+
+def interpolation_sequential_search(array, target, upper=False):
+    """
+    Search target element in the given array of numeric keys by a single
+    interpolation probe followed by a sequential scan
+
+    It is cheaper than `interpolation_search` when keys are so uniformly
+    distributed that the first probe lands a few slots away from the
+    result.
+
+    - Worst-case space complexity: O(1)
+    - Average performance: O(sqrt n) for uniformly distributed keys
+    - Worst-case performance: O(n)
+
+    :param array: given array of numbers
+    :type array: list[int] or list[float]
+    :param target: target element to search
+    :type target: int or float
+    :param upper: return the upper bound instead of the lower bound
+    :type upper: bool
+    :return: index as `binary_search_lower_bound` (or
+             `binary_search_upper_bound` if upper)
+    :rtype: int
+    """
+    # check base case
+    if len(array) == 0:
+        return -1
+    # targets out of the range of keys, including infinities which can
+    # not be interpolated
+    if not (target > array[0] or (upper and target == array[0])):
+        idx = 0
+    elif target > array[-1] or (upper and target == array[-1]):
+        idx = len(array)
+    else:
+        # array[0] <= target <= array[-1] and they are not all equal
+        idx = int((target - array[0]) * (len(array) - 1) / (array[-1] - array[0]))
+        idx = min(max(idx, 0), len(array) - 1)
+        if target > array[idx] or (upper and target == array[idx]):
+            # scan to the right
+            idx += 1
+            while idx < len(array) and (target > array[idx] or (
+                    upper and target == array[idx])):
+                idx += 1
+        else:
+            # scan to the left
+            while idx > 0 and not (target > array[idx - 1] or (
+                    upper and target == array[idx - 1])):
+                idx -= 1
+    return idx - 1 if upper else idx
+
+
+def bisect_predicate(lo, hi, pred, tol=None):
+    """
+    Search the smallest x in [lo, hi] where the monotone predicate holds,
+    i.e. pred(x) is False for all x before it and True for all x after it
+
+    The domain is integers if lo and hi are both int and tol is not given,
+    otherwise it is real numbers and the search stops once the bracket is
+    narrower than tol.
+
+    - Worst-case space complexity: O(1)
+    - Worst-case performance: O(log((hi - lo) / tol)) calls of pred
+
+    :param lo: lower bound of domain
+    :type lo: int or float
+    :param hi: upper bound of domain
+    :type hi: int or float
+    :param pred: monotone predicate
+    :type pred: Callable[[int or float], bool]
+    :param tol: absolute tolerance for real domain, default is 1e-9
+    :type tol: float
+    :return: min(x) where pred(x) holds, hi + 1 (or math.inf for real
+             domain) if it never holds
+    :rtype: int or float
+    """
+    if tol is None and isinstance(lo, int) and isinstance(hi, int):
+        # pred(lb) is known to be False and pred(ub) to be True
+        lb = lo - 1
+        ub = hi + 1
+        while lb + 1 < ub:
+            mid = lb + (ub - lb) // 2
+            if pred(mid):
+                ub = mid
+            else:
+                lb = mid
+        return ub
+
+    if tol is None:
+        tol = 1e-9
+    if pred(lo):
+        return lo
+    if not pred(hi):
+        return math.inf
+    lb, ub = lo, hi
+    while ub - lb > tol:
+        mid = lb + (ub - lb) / 2
+        # no more float between lb and ub
+        if not lb < mid < ub:
+            break
+        if pred(mid):
+            ub = mid
+        else:
+            lb = mid
+    return ub
+
+
+class SortedFileSearcher:
+
+    def __init__(self, path, record_size=None, key=None) -> None:
+        """
+        Search a sorted file on disk through mmap
+
+        Records are either fixed-width (record_size bytes each) or
+        newline-delimited. Each probe of the binary search lands on a byte
+        offset and reads the single record starting there (or at the next
+        line), so a query touches O(log n) pages and never reads the whole
+        file.
+
+        :param path: path of sorted file
+        :type path: str
+        :param record_size: size of each record in bytes, None for lines
+        :type record_size: int
+        :param key: function to get comparable key of a record, which is
+                    given as bytes without the trailing newline
+        :type key: Callable[[bytes], Any]
+        """
+        super().__init__()
+        self.record_size = record_size
+        self.key = key if key is not None else (lambda record: record)
+        self._file = open(path, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        if self._size > 0:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # empty file can not be mapped
+            self._mm = b''
+        if record_size is not None:
+            assert self._size % record_size == 0
+
+    def _line_end(self, start):
+        """
+        Get end offset (exclusive of newline) of the line starting at given offset
+
+        :param start: offset of line start
+        :type start: int
+        :return: offset of the newline, or file size for the last line
+        :rtype: int
+        """
+        end = self._mm.find(b'\n', start)
+        return self._size if end < 0 else end
+
+    def _search(self, target, upper):
+        """
+        Get offset of the first record which is not less than (or greater
+        than, if upper) the target
+
+        :param target: target key to search
+        :type target: Any
+        :param upper: whether records equal to target go before it
+        :type upper: bool
+        :return: offset of the found record, file size for not found
+        :rtype: int
+        """
+        if self.record_size is not None:
+            size = self.record_size
+            lb = -1
+            ub = self._size // size
+            while lb + 1 < ub:
+                mid = lb + (ub - lb) // 2
+                record_key = self.key(self._mm[mid * size:(mid + 1) * size])
+                if target > record_key or (upper and target == record_key):
+                    lb = mid
+                else:
+                    ub = mid
+            return ub * size
+
+        # the result is a line start in [lb, ub], where lb is a line start
+        # and ub is either a line start or the file size
+        lb = 0
+        ub = self._size
+        while lb < ub:
+            mid = lb + (ub - lb) // 2
+            # probe the line containing mid, which ends before ub, so that
+            # either side of it is at most half of the byte range even if
+            # the line is very long
+            start = max(self._mm.rfind(b'\n', lb, mid) + 1, lb)
+            end = self._line_end(start)
+            record_key = self.key(self._mm[start:end])
+            if target > record_key or (upper and target == record_key):
+                lb = min(end + 1, self._size)
+            else:
+                ub = start
+        return lb
+
+    def lower_bound(self, target):
+        """
+        Get byte offset of the first record whose key is not less than target
+
+        :param target: target key to search
+        :type target: Any
+        :return: offset of the found record, file size for not found
+        :rtype: int
+        """
+        return self._search(target, upper=False)
+
+    def upper_bound(self, target):
+        """
+        Get byte offset of the first record whose key is greater than target
+
+        Records with key equal to target are in [lower_bound, upper_bound).
+
+        :param target: target key to search
+        :type target: Any
+        :return: offset of the found record, file size for not found
+        :rtype: int
+        """
+        return self._search(target, upper=True)
+
+    def records(self, start=0, stop=None):
+        """
+        Iterate over records in the given byte range
+
+        :param start: offset of the first record
+        :type start: int
+        :param stop: offset to stop at, default is the file size
+        :type stop: int
+        :return: records without trailing newline
+        :rtype: Iterator[bytes]
+        """
+        stop = self._size if stop is None else stop
+        while start < stop:
+            if self.record_size is not None:
+                end = start + self.record_size
+                yield self._mm[start:end]
+                start = end
+            else:
+                end = self._line_end(start)
+                yield self._mm[start:end]
+                start = end + 1
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+
+def _lower_bounds_of(sorted_targets, sorted_list):
+    """
+    Get lower bound in the sorted list of every target by merging them in
+    one pass
+
+    :param sorted_targets: targets sorted in ascending order
+    :type sorted_targets: list
+    :param sorted_list: given sorted list
+    :type sorted_list: list
+    :return: min(index) where sorted_list[index] >= target for each target
+    :rtype: array
+    """
+    bounds = array('q', [0]) * len(sorted_targets)
+    idx = 0
+    for target_idx, target in enumerate(sorted_targets):
+        while idx < len(sorted_list) and sorted_list[idx] < target:
+            idx += 1
+        bounds[target_idx] = idx
+    return bounds
+
+
+class CascadingIndex:
+
+    def __init__(self, sorted_lists) -> None:
+        """
+        Search one key across many sorted lists by fractional cascading
+
+        Every list L[i] is augmented into M[i], the merge of L[i] and every
+        other element of M[i+1]. Each element of M[i] keeps its lower bound
+        in L[i] and a bridge to its lower bound in M[i+1]. After a single
+        binary search in M[0], the lower bound in the next augmented list
+        is at most one step before the bridge, so a query costs
+        O(log n + k) instead of O(k log n).
+
+        - Space complexity: O(total length of lists)
+        - Worst-case performance: O(log n + k)
+
+        :param sorted_lists: lists sorted in ascending order
+        :type sorted_lists: list[list]
+        """
+        super().__init__()
+        self._lists = [list(sorted_list) for sorted_list in sorted_lists]
+        self._augmented = [[] for _ in self._lists]
+        self._positions = [array('q') for _ in self._lists]
+        self._bridges = [array('q') for _ in self._lists]
+        self._build(len(self._lists) - 1)
+
+    def _build(self, last):
+        """
+        Build augmented lists from the given level back to the first one
+
+        :param last: index of the last level to build
+        :type last: int
+        """
+        for level in range(last, -1, -1):
+            if level + 1 < len(self._lists):
+                below = self._augmented[level + 1]
+                augmented = sorted(self._lists[level] + below[1::2])
+                self._bridges[level] = _lower_bounds_of(augmented, below)
+            else:
+                augmented = self._lists[level][:]
+                self._bridges[level] = array('q')
+            self._augmented[level] = augmented
+            self._positions[level] = _lower_bounds_of(augmented, self._lists[level])
+
+    def update(self, updates):
+        """
+        Replace some of the lists and rebuild the affected levels in batch
+
+        Only the levels before the last replaced list are rebuilt.
+
+        :param updates: new sorted list for each index of list to replace
+        :type updates: dict[int, list]
+        """
+        if len(updates) == 0:
+            return
+        for level, sorted_list in updates.items():
+            self._lists[level] = list(sorted_list)
+        self._build(max(updates))
+
+    def lower_bound(self, target):
+        """
+        Search target element in all lists
+
+        :param target: target element to search
+        :type target: Any
+        :return: same as `binary_search_lower_bound` for each list
+        :rtype: list[int]
+        """
+        results = []
+        if len(self._lists) == 0:
+            return results
+        idx = _bisect_between(self._augmented[0], target, -1,
+                              len(self._augmented[0]), False)
+        for level, augmented in enumerate(self._augmented):
+            if len(self._lists[level]) == 0:
+                results.append(-1)
+            elif idx == len(augmented):
+                results.append(len(self._lists[level]))
+            else:
+                results.append(self._positions[level][idx])
+            if level + 1 == len(self._augmented):
+                break
+            below = self._augmented[level + 1]
+            # at most one element of the next level is in [target, augmented[idx])
+            idx = len(below) if idx == len(augmented) else self._bridges[level][idx]
+            if idx > 0 and below[idx - 1] >= target:
+                idx -= 1
+        return results
+
+    def __len__(self):
+        return len(self._lists)
+
+
+def benchmark_cascading_index(num_lists=32, size=10 ** 4, num_queries=10 ** 4):
+    """
+    Compare lookups of `CascadingIndex` against calling
+    `binary_search_lower_bound` on each list
+
+    :param num_lists: number of sorted lists
+    :type num_lists: int
+    :param size: length of each list
+    :type size: int
+    :param num_queries: number of lookups
+    :type num_queries: int
+    :return: seconds per lookup of (binary search, cascading index)
+    :rtype: tuple[float, float]
+    """
+    sorted_lists = [sorted(randrange(0, 10 * size) for _ in range(size))
+                    for _ in range(num_lists)]
+    index = CascadingIndex(sorted_lists)
+    queries = [randrange(0, 10 * size) for _ in range(num_queries)]
+
+    start = time.perf_counter()
+    for x in queries:
+        [binary_search_lower_bound(sorted_list, x) for sorted_list in sorted_lists]
+    baseline = (time.perf_counter() - start) / num_queries
+
+    start = time.perf_counter()
+    for x in queries:
+        index.lower_bound(x)
+    cascading = (time.perf_counter() - start) / num_queries
+
+    print('k = {}, n = {}: binary search {:.3e}s, cascading index {:.3e}s'.format(
+        num_lists, size, baseline, cascading))
+    return baseline, cascading
+
+
+class StaticSearchIndex:
+
+    def __init__(self, sorted_keys, typecode=None) -> None:
+        """
+        Read-only search index over a sorted sequence in Eytzinger layout
+
+        The keys are stored in a typed array in the order of a breadth-first
+        traversal of the implicit complete binary search tree (node k has
+        children 2k and 2k+1). The first levels of the tree share a few
+        cache lines and every probe goes to a predictable address, instead
+        of the cold midpoints touched by plain binary search.
+
+        - Space complexity: O(n)
+        - Worst-case performance: O(log n)
+
+        :param sorted_keys: keys sorted in ascending order
+        :type sorted_keys: list
+        :param typecode: typecode of the underlying array, inferred from keys
+                         if not given: 'q' for int keys fitting in 64 bits,
+                         'd' for float keys, and a plain list for any other
+                         keys (larger or mixed numbers, strings, tuples, ...)
+                         so that they compare exactly as in the list
+        :type typecode: str
+        """
+        super().__init__()
+        if typecode is None:
+            typecode = self._infer_typecode(sorted_keys)
+        self._size = len(sorted_keys)
+        # _rank[k] is the position in sorted order of the k-th node,
+        # _rank[0] stands for "past the end" of the sorted sequence
+        self._rank = self._eytzinger_order(self._size)
+        if typecode is None:
+            self._keys = [None] * (self._size + 1)
+        else:
+            self._keys = array(typecode, [0]) * (self._size + 1)
+        for k in range(1, self._size + 1):
+            self._keys[k] = sorted_keys[self._rank[k]]
+
+    @staticmethod
+    def _infer_typecode(sorted_keys):
+        """
+        Get typecode of an array which holds the keys exactly
+
+        :param sorted_keys: keys sorted in ascending order
+        :type sorted_keys: list
+        :return: 'q', 'd' or None if no typed array fits
+        :rtype: str
+        """
+        if all(type(key) is int for key in sorted_keys):
+            # keys are sorted, so the two ends tell whether all of them fit
+            if len(sorted_keys) == 0 or -2 ** 63 <= sorted_keys[0] <= sorted_keys[-1] < 2 ** 63:
+                return 'q'
+        elif all(type(key) is float for key in sorted_keys):
+            return 'd'
+        return None
+
+    @staticmethod
+    def _eytzinger_order(n):
+        """
+        Get sorted rank of each node in the Eytzinger layout by an
+        iterative in-order traversal
+
+        :param n: number of keys
+        :type n: int
+        :return: rank of each node, rank[0] is set to n
+        :rtype: array
+        """
+        rank = array('q', [0]) * (n + 1)
+        rank[0] = n
+        stack = []
+        idx = 0
+        k = 1
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k = 2 * k
+            k = stack.pop()
+            rank[k] = idx
+            idx += 1
+            k = 2 * k + 1
+        return rank
+
+    def _descend(self, target, strict):
+        """
+        Descend the implicit tree and get rank of the first key which is
+        not less than (or greater than, if strict) the target
+
+        :param target: target element to search
+        :type target: Any
+        :param strict: whether to search the first key greater than target
+        :type strict: bool
+        :return: rank of found key, n for not found
+        :rtype: int
+        """
+        keys = self._keys
+        n = self._size
+        k = 1
+        if strict:
+            while k <= n:
+                k = 2 * k + (keys[k] <= target)
+        else:
+            while k <= n:
+                k = 2 * k + (keys[k] < target)
+        # drop the trailing right turns and the last left turn
+        # to get back to the node where we turned left last time
+        k >>= ((~k) & (k + 1)).bit_length()
+        return self._rank[k]
+
+    def lower_bound(self, target):
+        """
+        Same as `binary_search_lower_bound`
+
+        :param target: target element to search
+        :type target: Any
+        :return: min(index) where array[index] >= target, -1 for empty index
+        :rtype: int
+        """
+        if self._size == 0:
+            return -1
+        return self._descend(target, strict=False)
+
+    def upper_bound(self, target):
+        """
+        Same as `binary_search_upper_bound`
+
+        :param target: target element to search
+        :type target: Any
+        :return: max(index) where array[index] <= target, -1 for empty index
+        :rtype: int
+        """
+        if self._size == 0:
+            return -1
+        return self._descend(target, strict=True) - 1
+
+    def contains(self, target):
+        """
+        Check whether the target element is in the index
+
+        :param target: target element to search
+        :type target: Any
+        :return: whether the target element is in the index
+        :rtype: bool
+        """
+        keys = self._keys
+        n = self._size
+        k = 1
+        while k <= n:
+            if keys[k] == target:
+                return True
+            k = 2 * k + (keys[k] < target)
+        return False
+
+    def __contains__(self, target):
+        return self.contains(target)
+
+    def __len__(self):
+        return self._size
+
+
+class LearnedIndex:
+
+    def __init__(self, sorted_keys, epsilon=64) -> None:
+        """
+        Learned index over sorted integer keys
+
+        The key-to-position mapping (the CDF of the keys) is approximated
+        by a piecewise-linear model in the way of the PGM-index: every
+        segment predicts the lower-bound position of any integer in its key
+        range with an error of at most epsilon. A lookup locates the segment
+        by binary search over the first keys of segments, evaluates the line
+        and binary searches the 2*epsilon window around the prediction.
+
+        Segments are fitted greedily with a shrinking cone of feasible slopes
+        in O(n). Besides distinct keys, the two ends of every gap between
+        consecutive keys are fitted as points (never split across segments),
+        so that the bound also holds for missing keys.
+
+        - Space complexity: O(n / epsilon) on top of the keys in practice
+        - Worst-case performance: O(log(n / epsilon) + log epsilon)
+
+        :param sorted_keys: integer keys sorted in ascending order
+        :type sorted_keys: list[int]
+        :param epsilon: maximum error of predicted positions
+        :type epsilon: int
+        """
+        super().__init__()
+        assert epsilon >= 1
+        self.epsilon = epsilon
+        self._keys = array('q')
+        self._seg_keys = array('q')
+        self._seg_pos = array('q')
+        self._seg_slopes = array('d')
+        self.extend(sorted_keys)
+
+    def _groups(self, start, prev_key):
+        """
+        Generate points to fit, starting from given position
+
+        :param start: position of the first key to fit
+        :type start: int
+        :param prev_key: key before the first key, None for no leading gap
+        :type prev_key: int
+        :return: groups of (key, position) points which are not to be split
+        :rtype: Iterator[tuple]
+        """
+        keys = self._keys
+        idx = start
+        while idx < len(keys):
+            key = keys[idx]
+            if prev_key is not None and prev_key + 1 < key:
+                # every missing key in the gap has the same lower bound
+                if prev_key + 2 < key:
+                    yield (prev_key + 1, idx), (key - 1, idx)
+                else:
+                    yield (prev_key + 1, idx),
+            yield (key, idx),
+            prev_key = key
+            # skip duplicates of key
+            while idx < len(keys) and keys[idx] == key:
+                idx += 1
+
+    def _fit(self, groups):
+        """
+        Fit segments on given points by the shrinking cone algorithm
+
+        :param groups: groups of (key, position) points
+        :type groups: Iterator[tuple]
+        """
+        eps = self.epsilon
+        seg_key = seg_pos = None
+        slope_lo, slope_hi = 0.0, math.inf
+        for group in groups:
+            if seg_key is not None:
+                lo, hi = slope_lo, slope_hi
+                for key, pos in group:
+                    lo = max(lo, (pos - eps - seg_pos) / (key - seg_key))
+                    hi = min(hi, (pos + eps - seg_pos) / (key - seg_key))
+                if lo <= hi:
+                    slope_lo, slope_hi = lo, hi
+                    continue
+                self._add_segment(seg_key, seg_pos, slope_lo, slope_hi)
+            # start a new segment from the first point of group
+            (seg_key, seg_pos), slope_lo, slope_hi = group[0], 0.0, math.inf
+            for key, pos in group[1:]:
+                slope_lo = max(slope_lo, (pos - eps - seg_pos) / (key - seg_key))
+                slope_hi = min(slope_hi, (pos + eps - seg_pos) / (key - seg_key))
+        if seg_key is not None:
+            self._add_segment(seg_key, seg_pos, slope_lo, slope_hi)
+
+    def _add_segment(self, key, pos, slope_lo, slope_hi):
+        """
+        Append a segment with the slope in the middle of the feasible cone
+
+        :param key: first key of the segment
+        :type key: int
+        :param pos: position of the first key
+        :type pos: int
+        :param slope_lo: minimum feasible slope
+        :type slope_lo: float
+        :param slope_hi: maximum feasible slope
+        :type slope_hi: float
+        """
+        self._seg_keys.append(key)
+        self._seg_pos.append(pos)
+        self._seg_slopes.append(
+            slope_lo if slope_hi == math.inf else (slope_lo + slope_hi) / 2)
+
+    def extend(self, sorted_keys):
+        """
+        Append keys which are not less than the last key and rebuild the
+        model in bulk
+
+        Only the last segment is refitted, since appending keys does not
+        change the positions covered by the segments before it.
+
+        :param sorted_keys: integer keys sorted in ascending order
+        :type sorted_keys: list[int]
+        """
+        if len(sorted_keys) == 0:
+            return
+        assert len(self._keys) == 0 or sorted_keys[0] >= self._keys[-1]
+        if len(self._seg_keys) > 0:
+            start = self._seg_pos.pop()
+            prev_key = None if self._seg_keys.pop() == self._keys[start] \
+                else self._keys[start - 1]
+            self._seg_slopes.pop()
+        else:
+            start, prev_key = 0, None
+        self._keys.extend(sorted_keys)
+        self._fit(self._groups(start, prev_key))
+
+    def lower_bound(self, target):
+        """
+        Same as `binary_search_lower_bound`
+
+        :param target: target element to search
+        :type target: int or float
+        :return: min(index) where array[index] >= target, -1 for empty index
+        :rtype: int
+        """
+        keys = self._keys
+        if len(keys) == 0:
+            return -1
+        if not isinstance(target, int):
+            target = math.ceil(target)
+        if target <= keys[0]:
+            return 0
+        if target > keys[-1]:
+            return len(keys)
+        seg = binary_search_upper_bound(self._seg_keys, target)
+        pos = self._seg_pos[seg] + int(round(
+            self._seg_slopes[seg] * (target - self._seg_keys[seg])))
+        # one more slot on each side for the floating point rounding
+        lb = max(pos - self.epsilon - 1, 0)
+        ub = min(pos + self.epsilon + 1, len(keys))
+        return _bisect_between(keys, target, lb - 1, ub, False)
+
+    def upper_bound(self, target):
+        """
+        Same as `binary_search_upper_bound`
+
+        :param target: target element to search
+        :type target: int or float
+        :return: max(index) where array[index] <= target, -1 for empty index
+        :rtype: int
+        """
+        if len(self._keys) == 0:
+            return -1
+        return self.lower_bound(math.floor(target) + 1) - 1
+
+    def contains(self, target):
+        """
+        Check whether the target element is in the index
+
+        :param target: target element to search
+        :type target: int
+        :return: whether the target element is in the index
+        :rtype: bool
+        """
+        idx = self.lower_bound(target)
+        return 0 <= idx < len(self._keys) and self._keys[idx] == target
+
+    @property
+    def num_segments(self):
+        return len(self._seg_keys)
+
+    def model_size(self):
+        """
+        Get size of the model without the keys
+
+        :return: size of the model in bytes
+        :rtype: int
+        """
+        return sum(seg.itemsize * len(seg) for seg in
+                   (self._seg_keys, self._seg_pos, self._seg_slopes))
+
+    def __contains__(self, target):
+        return self.contains(target)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def benchmark_static_search_index(sizes=(10 ** 6, 10 ** 7, 10 ** 8),
+                                  num_queries=10 ** 5):
+    """
+    Compare lookups of `StaticSearchIndex` against
+    `binary_search_lower_bound` on the same sorted keys
+
+    :param sizes: number of keys to benchmark with
+    :type sizes: tuple[int]
+    :param num_queries: number of lookups for each size
+    :type num_queries: int
+    :return: seconds per lookup of (binary search, static index) for each size
+    :rtype: dict[int, tuple[float, float]]
+    """
+    results = {}
+    for size in sizes:
+        keys = array('q', range(0, 2 * size, 2))
+        index = StaticSearchIndex(keys, typecode='q')
+        queries = [randrange(0, 2 * size) for _ in range(num_queries)]
+
+        start = time.perf_counter()
+        for x in queries:
+            binary_search_lower_bound(keys, x)
+        baseline = (time.perf_counter() - start) / num_queries
+
+        start = time.perf_counter()
+        for x in queries:
+            index.lower_bound(x)
+        eytzinger = (time.perf_counter() - start) / num_queries
+
+        results[size] = (baseline, eytzinger)
+        print('n = {:>11}: binary search {:.3e}s, static index {:.3e}s'.format(
+            size, baseline, eytzinger))
+    return results
+
+
 class TestBinarySearch(unittest.TestCase):
 
     def test_binary_search_recursive(self):
@@ -213,6 +1140,164 @@ class TestBinarySearch(unittest.TestCase):
         self.assertEqual(6, lb)
         self.assertEqual(8, ub)
 
+    def test_exponential_search(self):
+        val_list = [0, 1, 2, 3, 3, 5, 6, 6, 6, 7, 7, 8, 9]
+        for hint in range(-1, len(val_list) + 2):
+            for x in range(-2, 12):
+                self.assertEqual(binary_search_lower_bound(val_list, x),
+                                 exponential_search(val_list, x, hint))
+                self.assertEqual(binary_search_upper_bound(val_list, x),
+                                 exponential_search(val_list, x, hint, upper=True))
+        self.assertEqual(-1, exponential_search([], 1, 3))
+
+    def test_interpolation_search(self):
+        for val_list in ([0, 1, 2, 3, 3, 5, 6, 6, 6, 7, 7, 8, 9],
+                         sorted(randrange(0, 50) for _ in range(37)),
+                         [0.5, 0.5, 2.5, 40.0, 41.0],
+                         [3, 3, 3]):
+            for x in range(-2, 52):
+                lower = binary_search_lower_bound(val_list, x)
+                upper = binary_search_upper_bound(val_list, x)
+                self.assertEqual(lower, interpolation_search(val_list, x))
+                self.assertEqual(upper, interpolation_search(val_list, x, upper=True))
+                self.assertEqual(lower, interpolation_sequential_search(val_list, x))
+                self.assertEqual(upper, interpolation_sequential_search(
+                    val_list, x, upper=True))
+            for x in (-math.inf, math.inf):
+                for upper in (False, True):
+                    expected = (binary_search_upper_bound if upper else
+                                binary_search_lower_bound)(val_list, x)
+                    self.assertEqual(expected, interpolation_search(val_list, x, upper))
+                    self.assertEqual(expected, interpolation_sequential_search(
+                        val_list, x, upper))
+
+    def test_bisect_predicate(self):
+        self.assertEqual(37, bisect_predicate(0, 100, lambda x: x * x >= 1337))
+        self.assertEqual(0, bisect_predicate(0, 100, lambda x: True))
+        self.assertEqual(101, bisect_predicate(0, 100, lambda x: False))
+        self.assertAlmostEqual(math.sqrt(2), bisect_predicate(
+            0.0, 2.0, lambda x: x * x >= 2, tol=1e-12), places=10)
+        self.assertEqual(math.inf, bisect_predicate(0.0, 1.0, lambda x: x > 2))
+
+    def test_sorted_file_searcher(self):
+        val_list = sorted(randrange(0, 500) for _ in range(300))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # newline-delimited records
+            path = os.path.join(tmp_dir, 'lines.txt')
+            lines = ['{:d},{}'.format(val, 'x' * (val % 7)) for val in val_list]
+            with open(path, 'w') as f:
+                f.write('\n'.join(lines))
+            with SortedFileSearcher(path, key=lambda r: int(r.split(b',')[0])) as searcher:
+                for x in range(-1, 502):
+                    lb = searcher.lower_bound(x)
+                    ub = searcher.upper_bound(x)
+                    found = [int(r.split(b',')[0]) for r in searcher.records(lb, ub)]
+                    self.assertListEqual([val for val in val_list if val == x], found)
+                    self.assertEqual(binary_search_lower_bound(val_list, x),
+                                     len(list(searcher.records(0, lb))))
+            # fixed-width records
+            path = os.path.join(tmp_dir, 'records.bin')
+            with open(path, 'wb') as f:
+                f.write(b''.join(val.to_bytes(4, 'big') for val in val_list))
+            with SortedFileSearcher(path, record_size=4,
+                                    key=lambda r: int.from_bytes(r, 'big')) as searcher:
+                for x in range(-1, 502):
+                    self.assertEqual(binary_search_lower_bound(val_list, x),
+                                     searcher.lower_bound(x) // 4)
+                    self.assertEqual(binary_search_upper_bound(val_list, x),
+                                     searcher.upper_bound(x) // 4 - 1)
+            # a single very long line must not make the search linear
+            for long_idx in (0, 1000, 1999):
+                path = os.path.join(tmp_dir, 'long.txt')
+                lines = ['{:06d}'.format(i) for i in range(2000)]
+                lines[long_idx] += 'x' * 100000
+                with open(path, 'w') as f:
+                    f.write('\n'.join(lines))
+                probes = []
+
+                def key(record):
+                    probes.append(record)
+                    return record[:6]
+
+                with SortedFileSearcher(path, key=key) as searcher:
+                    for i in (0, 500, long_idx, 1500, 1999, 2000):
+                        probes.clear()
+                        target = '{:06d}'.format(i).encode()
+                        offset = searcher.lower_bound(target)
+                        self.assertEqual(i, len(list(searcher.records(0, offset))))
+                        self.assertLessEqual(len(probes), 2 * len(searcher).bit_length())
+            # empty file
+            path = os.path.join(tmp_dir, 'empty.txt')
+            open(path, 'w').close()
+            with SortedFileSearcher(path) as searcher:
+                self.assertEqual(0, searcher.lower_bound(b'a'))
+
+    def test_learned_index(self):
+        val_list = sorted(randrange(0, 10000) for _ in range(2000))
+        val_list += [val_list[-1]] * 5 + [20000, 20001, 20002, 20010]
+        for epsilon in (1, 4, 32):
+            index = LearnedIndex(val_list, epsilon=epsilon)
+            for x in range(-2, 20015):
+                self.assertEqual(binary_search_lower_bound(val_list, x),
+                                 index.lower_bound(x))
+            for x in (-1.5, 0.5, 17.5, 20001.5, 30000.0):
+                self.assertEqual(binary_search_upper_bound(val_list, x),
+                                 index.upper_bound(x))
+        # bulk rebuild on append
+        index = LearnedIndex(val_list[:700], epsilon=8)
+        index.extend(val_list[700:1500])
+        index.extend(val_list[1500:])
+        self.assertLess(index.num_segments, len(val_list) // 8)
+        for x in range(-2, 20015):
+            self.assertEqual(binary_search_lower_bound(val_list, x),
+                             index.lower_bound(x))
+            self.assertEqual(x in val_list, x in index)
+        self.assertEqual(-1, LearnedIndex([]).lower_bound(1))
+
+    def test_cascading_index(self):
+        sorted_lists = [sorted(randrange(0, 100) for _ in range(randrange(0, 40)))
+                        for _ in range(12)] + [[], [5, 5, 5]]
+        index = CascadingIndex(sorted_lists)
+        for x in range(-2, 103):
+            self.assertListEqual(
+                [binary_search_lower_bound(sorted_list, x) for sorted_list in sorted_lists],
+                index.lower_bound(x))
+        # rebuild on batch update
+        sorted_lists[3] = [1, 2, 2, 3, 50]
+        sorted_lists[7] = sorted(randrange(0, 100) for _ in range(60))
+        index.update({3: sorted_lists[3], 7: sorted_lists[7]})
+        for x in range(-2, 103):
+            self.assertListEqual(
+                [binary_search_lower_bound(sorted_list, x) for sorted_list in sorted_lists],
+                index.lower_bound(x))
+        self.assertListEqual([], CascadingIndex([]).lower_bound(1))
+
+    def test_static_search_index(self):
+        for val_list in ([0, 1, 2, 3, 3, 5, 6, 6, 6, 7, 7, 8, 9],
+                         sorted(randrange(0, 50) for _ in range(37)),
+                         [1.5, 2.5, 2.5, 4.0],
+                         [4]):
+            index = StaticSearchIndex(val_list)
+            for x in range(-2, 52):
+                self.assertEqual(binary_search_lower_bound(val_list, x),
+                                 index.lower_bound(x))
+                self.assertEqual(binary_search_upper_bound(val_list, x),
+                                 index.upper_bound(x))
+                self.assertEqual(x in val_list, x in index)
+        # keys which do not fit in a typed array
+        for val_list, probes in (([-2 ** 70, 0, 2 ** 63, 2 ** 63, 2 ** 64 + 1], [2 ** 63 - 1, 1]),
+                                 ([1, 1.5, 2, 2 ** 60 + 1], [2 ** 60, 1.25]),
+                                 (['', 'a', 'ab', 'b', 'b', 'ba'], ['aa', 'c', '0'])):
+            index = StaticSearchIndex(val_list)
+            for x in val_list + probes:
+                self.assertEqual(binary_search_lower_bound(val_list, x),
+                                 index.lower_bound(x))
+                self.assertEqual(binary_search_upper_bound(val_list, x),
+                                 index.upper_bound(x))
+                self.assertEqual(x in val_list, x in index)
+        self.assertEqual(-1, StaticSearchIndex([]).lower_bound(1))
+        self.assertFalse(StaticSearchIndex([]).contains(1))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -24,9 +24,29 @@ Given a knapsack weight W and a set of n items with certain value val[i] and
 weight wti, we need to calculate minimum amount that could make up this
 quantity exactly. This is different from classical Knapsack problem, here we
 are allowed to use unlimited number of instances of an item.
+
+Bounded Knapsack problem
+---
+Same as the classical knapsack problem, except that there are count[i]
+instances of the i-th item, so it can be taken up to count[i] times.
 """
 
 import unittest
+import os
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from operator import ne
+from random import Random, randint
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .binary_search import binary_search_upper_bound
+from .math_util import gcd
 
 
 def knapsack_0_1_recursive(w, wt, vt, n):
@@ -120,7 +140,7 @@ def knapsack_0_1_dp(w, wt, vt, n):
         for w_idx in range(w + 1):
             if n_idx == 0 or w_idx == 0:
                 dp[n_idx][w_idx] = 0
-            elif wt[n_idx - 1] > w:
+            elif wt[n_idx - 1] > w_idx:
                 dp[n_idx][w_idx] = dp[n_idx - 1][w_idx]
             else:
                 dp[n_idx][w_idx] = max(
@@ -130,6 +150,416 @@ def knapsack_0_1_dp(w, wt, vt, n):
     return dp[n][w]
 
 
+def _knapsack_0_1_row(w, wt, vt, n, row=None):
+    """
+    Fill the last row of 0-1 knapsack DP table with a rolling row
+
+    The row for the first i items only depends on the row for the first
+    i-1 items, and updating the capacities in reverse order (or from a
+    snapshot of the previous row, as a slice operation does) ensures that
+    each item is taken at most once. Since the update of each item is
+    independent of the order of items, a row can be continued with more
+    items later.
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :param row: row of previous items to continue from, None for empty
+    :type row: numpy.ndarray or array or list[int]
+    :return: maximum value for each capacity in [0, w]
+    :rtype: numpy.ndarray or array or list[int]
+    """
+    # typed row is only safe if the values never overflow int64
+    typed = (0 if row is None else int(row[w])) + sum(vt[:n]) < 2 ** 63
+    if np is not None and typed:
+        row = np.zeros(w + 1, dtype=np.int64) if row is None else \
+            np.asarray(row, dtype=np.int64)
+        for n_idx in range(n):
+            weight, value = wt[n_idx], vt[n_idx]
+            if weight > w:
+                continue
+            elif weight == 0:
+                row += max(value, 0)
+            else:
+                np.maximum(row[weight:], row[:-weight] + value, out=row[weight:])
+        return row
+
+    make_row = (lambda values: array('q', values)) if typed else list
+    row = make_row([0]) * (w + 1) if row is None else make_row(map(int, row))
+    for n_idx in range(n):
+        weight, value = wt[n_idx], vt[n_idx]
+        if weight > w:
+            continue
+        elif weight == 0:
+            if value > 0:
+                row = make_row(map(value.__add__, row))
+        else:
+            # right side is evaluated from the previous row before assignment
+            row[weight:] = make_row(map(
+                max, row[weight:], map(value.__add__, row[:w + 1 - weight])))
+    return row
+
+
+def knapsack_0_1_rolling(w, wt, vt, n):
+    """
+    A Dynamic Programming based solution for 0-1 Knapsack problem with
+    O(w) memory
+
+    It fills the same table as `knapsack_0_1_dp` row by row, but keeps only
+    one row. Each item is one vectorized pass over the row, by
+    `np.maximum(row[wt:], row[:-wt] + v)` if NumPy is available and by a
+    slice assignment over a typed array otherwise.
+
+    Items of zero weight are always taken. `knapsack_0_1_recursive` and
+    `knapsack_0_1_dp` stop at capacity 0 and may miss them, so the results
+    differ for instances with positive-value zero-weight items.
+
+    - Time Complexity: O(n*w)
+    - Space Complexity: O(w)
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :return: the maximum value that can be put in a knapsack of capacity w
+    :rtype: int
+    """
+    return int(_knapsack_0_1_row(w, wt, vt, n)[w])
+
+
+class KnapsackTable:
+
+    def __init__(self, wt, vt, w) -> None:
+        """
+        Maximum values of 0-1 knapsack for every capacity up to w
+
+        The last row of the DP table answers the problem for every
+        capacity at once, as dp[c] is the best value within capacity c.
+        It is built once in O(n*w) and each query is a lookup. Adding
+        items continues the rolling row instead of recomputing it.
+
+        :param wt: weight of each element
+        :type wt: list[int]
+        :param vt: value of each element
+        :type vt: list[int]
+        :param w: maximum capacity to query
+        :type w: int
+        """
+        super().__init__()
+        self.capacity = w
+        self._row = None
+        self._num_items = 0
+        self.add_items(wt, vt)
+
+    def add_items(self, wt, vt):
+        """
+        Add items to the table
+
+        :param wt: weight of each new element
+        :type wt: list[int]
+        :param vt: value of each new element
+        :type vt: list[int]
+        """
+        assert len(wt) == len(vt)
+        self._row = _knapsack_0_1_row(self.capacity, wt, vt, len(wt), self._row)
+        self._num_items += len(wt)
+
+    def best_value(self, c):
+        """
+        Get maximum value in a knapsack of given capacity
+
+        :param c: capacity, no more than w of the table
+        :type c: int
+        :return: the maximum value that can be put in a knapsack of capacity c
+        :rtype: int
+        """
+        assert 0 <= c <= self.capacity
+        return int(self._row[c])
+
+    def __getitem__(self, c):
+        return self.best_value(c)
+
+    def __len__(self):
+        return self._num_items
+
+
+def _solve_instance(args):
+    """
+    Solve one instance in a worker process
+
+    :param args: solver and its arguments
+    :type args: tuple
+    :return: result of solver
+    :rtype: Any
+    """
+    solver, instance = args
+    return solver(*instance)
+
+
+def solve_many(instances, workers=None, solver=knapsack_0_1_rolling):
+    """
+    Solve many independent small instances in batches across a process pool
+
+    Instances are sent to the workers in chunks, so the overhead of
+    inter-process communication is paid once per chunk instead of once
+    per instance.
+
+    :param instances: arguments (w, wt, vt, n) of each instance
+    :type instances: list[tuple]
+    :param workers: number of worker processes, None for the number of CPUs
+                    and 1 to solve in the current process
+    :type workers: int
+    :param solver: solver to use, must be a module-level function
+    :type solver: Callable
+    :return: result of each instance in the same order
+    :rtype: list
+    """
+    instances = list(instances)
+    if workers == 1 or len(instances) <= 1:
+        return [solver(*instance) for instance in instances]
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, len(instances) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_solve_instance,
+                                 [(solver, instance) for instance in instances],
+                                 chunksize=chunk_size))
+
+
+def _density_order(w, wt, vt, n):
+    """
+    Sort useful items by value density for the LP relaxation
+
+    Items with no value or heavier than w are dropped, items with zero
+    weight are always taken.
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :return: value of free items, and weights and values sorted by density
+    :rtype: tuple[int, list[int], list[int]]
+    """
+    free = sum(vt[idx] for idx in range(n) if wt[idx] == 0 and vt[idx] > 0)
+    items = sorted((idx for idx in range(n) if 0 < wt[idx] <= w and vt[idx] > 0),
+                   key=lambda idx: vt[idx] / wt[idx], reverse=True)
+    return free, [wt[idx] for idx in items], [vt[idx] for idx in items]
+
+
+def knapsack_0_1_branch_and_bound_bounds(w, wt, vt, n, max_nodes=None, time_limit=None):
+    """
+    A branch and bound solution for 0-1 Knapsack problem within a budget
+    of search nodes or time, returning the best value found together with
+    an upper bound of the optimum
+
+    Items are sorted by value density, so that the bound of the fractional
+    (LP) relaxation is to take items greedily and a fraction of the first
+    item which does not fit. With prefix sums of weights, the break item
+    is found by binary search and each bound costs O(log n). The search
+    tree is explored depth first, taking an item before skipping it, and
+    a node is pruned if its bound is not better than the incumbent, which
+    starts from the greedy solution.
+
+    It is fast when the LP bound prunes well, as for random uncorrelated
+    values. When values are strongly correlated with weights, the bound is
+    close to the incumbent at many nodes and the search grows
+    exponentially. At n around 10^4 such instances may not finish in
+    minutes, so give a budget to get an answer in time. When the budget
+    runs out, the optimum is at most the largest LP bound of the nodes not
+    yet explored, so the gap between the two values is certified.
+
+    - Worst-case time performance: O(2^n), or O(max_nodes log n)
+    - Space complexity: O(n)
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :param max_nodes: maximum number of search nodes to explore, None for
+                      unlimited
+    :type max_nodes: int
+    :param time_limit: maximum seconds to search, None for unlimited
+    :type time_limit: float
+    :return: the best value found within the budget, and an upper bound of
+             the maximum value, which are equal if the search completed
+    :rtype: tuple[int, int]
+    """
+    free, weights, values = _density_order(w, wt, vt, n)
+    prefix_wt = [0]
+    prefix_vt = [0]
+    for weight, value in zip(weights, values):
+        prefix_wt.append(prefix_wt[-1] + weight)
+        prefix_vt.append(prefix_vt[-1] + value)
+
+    def lp_bound(idx, cap, val):
+        # items in [idx, brk) fit entirely
+        brk = binary_search_upper_bound(prefix_wt, prefix_wt[idx] + cap)
+        full = val + prefix_vt[brk] - prefix_vt[idx]
+        if brk >= len(weights):
+            return brk, full, full
+        # floor of the fractional bound, since values are integers
+        rest = prefix_wt[idx] + cap - prefix_wt[brk]
+        return brk, full, full + rest * values[brk] // weights[brk]
+
+    # the greedy solution as incumbent
+    best = 0
+    cap = w
+    for weight, value in zip(weights, values):
+        if weight <= cap:
+            cap -= weight
+            best += value
+
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    nodes = 0
+    # (index of next item, remaining capacity, value so far)
+    stack = [(0, w, 0)]
+    while stack:
+        if max_nodes is not None and nodes >= max_nodes:
+            break
+        # checking the clock is much slower than a node
+        if deadline is not None and nodes % 256 == 0 and time.perf_counter() >= deadline:
+            break
+        nodes += 1
+        idx, cap, val = stack.pop()
+        brk, full, bound = lp_bound(idx, cap, val)
+        if brk >= len(weights):
+            best = max(best, full)
+            continue
+        best = max(best, val)
+        if bound <= best:
+            continue
+        stack.append((idx + 1, cap, val))
+        if weights[idx] <= cap:
+            stack.append((idx + 1, cap - weights[idx], val + values[idx]))
+    upper = max([best] + [lp_bound(idx, cap, val)[2] for idx, cap, val in stack])
+    return free + best, free + upper
+
+
+def knapsack_0_1_branch_and_bound(w, wt, vt, n, max_nodes=None, time_limit=None):
+    """
+    An exact branch and bound solution for 0-1 Knapsack problem, see
+    `knapsack_0_1_branch_and_bound_bounds`
+
+    - Worst-case time performance: O(2^n)
+    - Space complexity: O(n)
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :param max_nodes: maximum number of search nodes to explore, None for
+                      unlimited
+    :type max_nodes: int
+    :param time_limit: maximum seconds to search, None for unlimited
+    :type time_limit: float
+    :return: the maximum value that can be put in a knapsack of capacity w,
+             or the best value found if the budget runs out
+    :rtype: int
+    """
+    return knapsack_0_1_branch_and_bound_bounds(w, wt, vt, n, max_nodes, time_limit)[0]
+
+
+def knapsack_0_1_fptas(w, wt, vt, n, eps=0.1):
+    """
+    A (1 - eps)-approximation of 0-1 Knapsack problem by FPTAS
+
+    Values are scaled down by K = eps * LB / n, where LB is a lower bound
+    of the optimum (the better of the greedy solution and the most
+    valuable item), and rounded down. Then the DP over scaled value
+    computes the minimum weight to achieve each scaled value, together
+    with the true value of that set. Rounding loses less than K per item,
+    so the result is at least (1 - eps) of the optimum, and since the LP
+    bound is at most 2 * LB the DP row has only O(n / eps) entries.
+
+    The quality bound holds for any capacity, but the running time does
+    not reach milliseconds at large n. Each item is a pass over a row of
+    O(n / eps) entries, so n = 10^4 with eps = 0.1 takes a few seconds,
+    even with the passes vectorized.
+
+    - Time Complexity: O(n^2 / eps)
+    - Space Complexity: O(n / eps)
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :param eps: relative error, in (0, 1)
+    :type eps: float
+    :return: a value at least (1 - eps) of the maximum value that can be
+             put in a knapsack of capacity w
+    :rtype: int
+    """
+    assert 0 < eps < 1
+    free, weights, values = _density_order(w, wt, vt, n)
+    if len(weights) == 0:
+        return free
+    # greedy lower bound and LP upper bound
+    lower = upper = 0
+    cap = w
+    for weight, value in zip(weights, values):
+        if weight <= cap:
+            cap -= weight
+            lower += value
+        elif upper == 0:
+            upper = lower + cap * value / weight
+    upper = max(upper, lower)
+    lower = max(lower, max(values))
+    scale = eps * lower / len(weights)
+    scaled = [int(value // scale) for value in values]
+    size = int(upper // scale) + 1
+
+    # min_wt[p] is the minimum weight to get scaled value p and
+    # real_vt[p] is the true value of that set
+    unreachable = w + 1
+    if np is not None and sum(values) < 2 ** 63:
+        min_wt = np.full(size, unreachable, dtype=np.int64)
+        real_vt = np.zeros(size, dtype=np.int64)
+        min_wt[0] = 0
+        for weight, value, p in zip(weights, values, scaled):
+            if p == 0 or p >= size:
+                continue
+            candidate = min_wt[:-p] + weight
+            better = candidate < min_wt[p:]
+            min_wt[p:][better] = candidate[better]
+            real_vt[p:][better] = real_vt[:-p][better] + value
+        best = int(real_vt[min_wt <= w].max())
+    else:
+        min_wt = [unreachable] * size
+        real_vt = [0] * size
+        min_wt[0] = 0
+        for weight, value, p in zip(weights, values, scaled):
+            for idx in range(size - 1, p - 1, -1):
+                if min_wt[idx - p] + weight < min_wt[idx]:
+                    min_wt[idx] = min_wt[idx - p] + weight
+                    real_vt[idx] = real_vt[idx - p] + value
+        best = max(real for weight, real in zip(min_wt, real_vt) if weight <= w)
+    return free + best
+
+
 def get_knapsack_0_1_solution(w, wt, vt, n):
     """
     Print solution of 0-1 knapsack problem
@@ -152,7 +582,7 @@ def get_knapsack_0_1_solution(w, wt, vt, n):
         for w_idx in range(w + 1):
             if n_idx == 0 or w_idx == 0:
                 dp[n_idx][w_idx] = 0
-            elif wt[n_idx - 1] > w:
+            elif wt[n_idx - 1] > w_idx:
                 dp[n_idx][w_idx] = dp[n_idx - 1][w_idx]
             else:
                 dp[n_idx][w_idx] = max(
@@ -179,6 +609,248 @@ def get_knapsack_0_1_solution(w, wt, vt, n):
     return solution
 
 
+def get_knapsack_0_1_solution_hirschberg(w, wt, vt, n):
+    """
+    Get solution of 0-1 knapsack problem in O(w) memory by divide and
+    conquer in the way of Hirschberg's algorithm
+
+    Split the items into two halves and compute the last DP row of each
+    half with `_knapsack_0_1_row`. The optimal split of capacity between
+    them is the c maximizing first[c] + second[w - c], then recurse into
+    both halves with their own capacity. Since the capacities of the
+    halves sum up to w, each level of recursion costs at most half of the
+    previous one, so computing rows takes about twice the time of
+    `knapsack_0_1_rolling`. With NumPy the split is one vectorized argmax
+    per call, and the whole search stays at about twice
+    `knapsack_0_1_rolling`. Without NumPy the split is a Python loop of
+    O(w log n) iterations in total, which may cost more than the rows.
+
+    Ties are broken by giving as much capacity as possible to the earlier
+    half, so that the later items are taken only when needed. The result
+    is the same as `get_knapsack_0_1_solution` if the optimal set is
+    unique, otherwise it is another optimal set.
+
+    - Time Complexity: O(n*w)
+    - Space Complexity: O(w + n)
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :return: indices of items to achieve maximum value in capacity w,
+             in descending order
+    :rtype: list[int]
+    """
+    solution = []
+
+    def solve(lo, hi, cap):
+        if hi - lo == 1:
+            if wt[lo] <= cap and vt[lo] > 0:
+                solution.append(lo)
+            return
+        mid = lo + (hi - lo) // 2
+        first = _knapsack_0_1_row(cap, wt[lo:mid], vt[lo:mid], mid - lo)
+        second = _knapsack_0_1_row(cap, wt[mid:hi], vt[mid:hi], hi - mid)
+        # the last c of max(first[c] + second[cap - c]), rows are
+        # non-decreasing so the sum fits in int64 if it does at cap
+        if isinstance(first, np.ndarray if np is not None else ()) and \
+                isinstance(second, np.ndarray) and int(first[cap]) + int(second[cap]) < 2 ** 63:
+            # reversed, so that argmax picks the last c of ties
+            best_cap = cap - int(np.argmax(first[cap::-1] + second[:cap + 1]))
+        else:
+            best_cap, best_val = 0, None
+            for c in range(cap, -1, -1):
+                val = first[c] + second[cap - c]
+                if best_val is None or val > best_val:
+                    best_cap, best_val = c, val
+        del first, second
+        solve(mid, hi, cap - best_cap)
+        solve(lo, mid, best_cap)
+
+    if n > 0:
+        solve(0, n, w)
+    return sorted(solution, reverse=True)
+
+
+def get_knapsack_0_1_solution_bits(w, wt, vt, n):
+    """
+    Get solution of 0-1 knapsack problem from a bit-packed decision matrix
+
+    Instead of the whole table of values, keep one rolling row of values
+    and, for each item, one bit per capacity telling whether the item
+    improves the value. Tracing back the bits makes the same decisions as
+    `get_knapsack_0_1_solution`. The bits are packed by `np.packbits` if
+    NumPy is available, otherwise one byte is used per capacity.
+
+    - Time Complexity: O(n*w)
+    - Space Complexity: O(n*w) bits
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :return: indices of items to achieve maximum value in capacity w
+    :rtype: list[int]
+    """
+    use_numpy = np is not None and sum(vt[:n]) < 2 ** 63
+    decisions = []
+    if use_numpy:
+        row = np.zeros(w + 1, dtype=np.int64)
+    else:
+        row = [0] * (w + 1)
+    for n_idx in range(n):
+        weight, value = wt[n_idx], vt[n_idx]
+        if weight > w:
+            decisions.append(None)
+            continue
+        if use_numpy:
+            candidate = row[:w + 1 - weight] + value
+            taken = candidate > row[weight:]
+            row[weight:][taken] = candidate[taken]
+            decisions.append(np.packbits(taken))
+        else:
+            new_part = list(map(max, row[weight:], map(value.__add__, row[:w + 1 - weight])))
+            decisions.append(bytes(map(ne, new_part, row[weight:])))
+            row[weight:] = new_part
+
+    solution = []
+    w_idx = w
+    for n_idx in range(n - 1, -1, -1):
+        weight, bits = wt[n_idx], decisions[n_idx]
+        if bits is None or w_idx < weight:
+            continue
+        offset = w_idx - weight
+        if use_numpy:
+            taken = (bits[offset >> 3] >> (7 - (offset & 7))) & 1
+        else:
+            taken = bits[offset]
+        if taken:
+            solution.append(n_idx)
+            w_idx -= weight
+    return solution
+
+
+def _pareto_frontier(w, wt, vt):
+    """
+    Get the non-dominated (weight, value) states of 0-1 knapsack
+
+    States are kept in two arrays sorted by weight, with strictly
+    increasing values. For each item, the states shifted by the item are
+    merged with the current states, dropping every state which is not
+    more valuable than a lighter one.
+
+    :param w: total capacity
+    :type w: int or float
+    :param wt: weight of each element
+    :type wt: list[int] or list[float]
+    :param vt: value of each element
+    :type vt: list[int] or list[float]
+    :return: weights and values of the states
+    :rtype: tuple[list, list]
+    """
+    weights, values = [0], [0]
+    for weight, value in zip(wt, vt):
+        if weight > w or value <= 0:
+            continue
+        # states shifted by current item, still sorted by weight
+        shifted = 0
+        while shifted < len(weights) and weights[shifted] + weight <= w:
+            shifted += 1
+        new_weights, new_values = [], []
+        i = j = 0
+        while i < len(weights) or j < shifted:
+            if j == shifted or (i < len(weights) and weights[i] <= weights[j] + weight):
+                cur_weight, cur_value = weights[i], values[i]
+                i += 1
+            else:
+                cur_weight, cur_value = weights[j] + weight, values[j] + value
+                j += 1
+            if len(new_values) > 0 and cur_value <= new_values[-1]:
+                continue
+            if len(new_weights) > 0 and cur_weight == new_weights[-1]:
+                new_values[-1] = cur_value
+            else:
+                new_weights.append(cur_weight)
+                new_values.append(cur_value)
+        weights, values = new_weights, new_values
+    return weights, values
+
+
+def knapsack_0_1_pareto(w, wt, vt, n):
+    """
+    A sparse solution for 0-1 knapsack problem keeping only the Pareto
+    optimal (weight, value) states
+
+    A state is dominated if another state is not heavier but at least as
+    valuable. Only the non-dominated states can lead to the optimal
+    value, so the cost depends on the number of such states instead of
+    the capacity, which suits huge capacities with few items.
+
+    - Time Complexity: O(n*s) where s is the maximum number of
+      non-dominated states, bounded by min(2^n, w)
+
+    :param w: total capacity
+    :type w: int or float
+    :param wt: weight of each element
+    :type wt: list[int] or list[float]
+    :param vt: value of each element
+    :type vt: list[int] or list[float]
+    :param n: number of elements
+    :type n: int
+    :return: the maximum value that can be put in a knapsack of capacity w
+    :rtype: int or float
+    """
+    _, values = _pareto_frontier(w, wt[:n], vt[:n])
+    return values[-1]
+
+
+def knapsack_0_1_meet_in_middle(w, wt, vt, n):
+    """
+    A meet-in-the-middle solution for 0-1 knapsack problem
+
+    The items are split into two halves, and the subsets of each half are
+    enumerated into at most 2^(n/2) non-dominated states. The states of
+    the first half are visited from light to heavy while a pointer walks
+    the states of the second half from heavy to light, to find the best
+    value of each pair fitting in the capacity. It works for arbitrary
+    (e.g. float) weights, and is suitable for n up to about 50.
+
+    - Time Complexity: O(n*2^(n/2))
+    - Space Complexity: O(2^(n/2))
+
+    :param w: total capacity
+    :type w: int or float
+    :param wt: weight of each element
+    :type wt: list[int] or list[float]
+    :param vt: value of each element
+    :type vt: list[int] or list[float]
+    :param n: number of elements
+    :type n: int
+    :return: the maximum value that can be put in a knapsack of capacity w
+    :rtype: int or float
+    """
+    mid = n // 2
+    first_weights, first_values = _pareto_frontier(w, wt[:mid], vt[:mid])
+    second_weights, second_values = _pareto_frontier(w, wt[mid:n], vt[mid:n])
+    res = 0
+    j = len(second_weights) - 1
+    for i in range(len(first_weights)):
+        while j >= 0 and first_weights[i] + second_weights[j] > w:
+            j -= 1
+        if j < 0:
+            break
+        res = max(res, first_values[i] + second_values[j])
+    return res
+
+
 def knapsack_unbounded(w, wt, vt, n):
     """
     It's an unbounded knapsack problem as we can use 1 or more instances of
@@ -216,8 +888,268 @@ def knapsack_unbounded(w, wt, vt, n):
     return dp[w]
 
 
+# a Python-level monotone deque pass costs about as much as this
+# number of 0-1 passes over the same row (measured with w = 2e5)
+_DEQUE_PASS_COST = 2 if np is None else 256
+
+
+def _bounded_pieces(wt, vt, counts):
+    """
+    Split bounded items into 0-1 items by binary splitting
+
+    c copies of an item are split into pieces of 1, 2, 4, ... copies and
+    a remainder, so that every count in [0, c] is a sum of some pieces.
+
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param counts: number of instances of each element
+    :type counts: list[int]
+    :return: item index and number of copies of each piece
+    :rtype: list[tuple[int, int]]
+    """
+    pieces = []
+    for idx, count in enumerate(counts):
+        size = 1
+        while count > 0:
+            size = min(size, count)
+            pieces.append((idx, size))
+            count -= size
+            size *= 2
+    return pieces
+
+
+def _knapsack_bounded_deque(w, wt, vt, counts, keep_choices=False):
+    """
+    Solve bounded knapsack by the monotone queue optimization
+
+    For the item with weight a, value b and count c, the capacities with
+    the same residue r modulo a form a chain j = r + k*a, where
+
+        dp[j] = max{old[r + t*a] - t*b | k-c <= t <= k} + k*b
+
+    is a sliding window maximum, maintained by a monotone deque in O(1)
+    amortized per capacity.
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param counts: number of instances of each element
+    :type counts: list[int]
+    :param keep_choices: whether to keep the count taken for each capacity
+    :type keep_choices: bool
+    :return: maximum value for each capacity in [0, w], and the count taken
+             of each item for each capacity if keep_choices
+    :rtype: tuple[list[int], list[array]]
+    """
+    row = [0] * (w + 1)
+    choices = []
+    for weight, value, count in zip(wt, vt, counts):
+        taken = array('I', [0]) * (w + 1) if keep_choices else None
+        choices.append(taken)
+        if count <= 0 or weight > w or value <= 0:
+            continue
+        if weight == 0:
+            row = [val + count * value for val in row]
+            if keep_choices:
+                taken[:] = array('I', [count]) * (w + 1)
+            continue
+        old = row[:]
+        for r in range(weight):
+            # (t, old[r + t*a] - t*b) in decreasing order of value
+            window = deque()
+            for k, j in enumerate(range(r, w + 1, weight)):
+                val = old[j] - k * value
+                while window and window[-1][1] <= val:
+                    window.pop()
+                window.append((k, val))
+                if window[0][0] < k - count:
+                    window.popleft()
+                row[j] = window[0][1] + k * value
+                if keep_choices:
+                    taken[j] = k - window[0][0]
+    return row, choices
+
+
+def knapsack_bounded(w, wt, vt, counts, method=None):
+    """
+    A Dynamic Programming based solution for bounded knapsack problem
+
+    There are two engines:
+
+    - 'binary': split each item into O(log c) 0-1 items by binary
+      splitting and run the rolling 0-1 DP, in O(w*sum(log c)) with one
+      vectorized pass per piece.
+    - 'deque': monotone queue optimization per residue class, in O(n*w)
+      but with Python-level work per capacity.
+
+    By default the cheaper one for the given counts is picked.
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param counts: number of instances of each element
+    :type counts: list[int]
+    :param method: 'binary', 'deque' or None for automatic
+    :type method: str
+    :return: the maximum value that can be put in a knapsack of capacity w
+    :rtype: int
+    """
+    pieces = _bounded_pieces(wt, vt, counts)
+    if method is None:
+        method = 'binary' if len(pieces) <= _DEQUE_PASS_COST * len(counts) else 'deque'
+    if method == 'binary':
+        return int(_knapsack_0_1_row(w, [wt[idx] * size for idx, size in pieces],
+                                     [vt[idx] * size for idx, size in pieces],
+                                     len(pieces))[w])
+    elif method == 'deque':
+        row, _ = _knapsack_bounded_deque(w, wt, vt, counts)
+        return row[w]
+    raise ValueError('unknown method: {}'.format(method))
+
+
+def get_knapsack_bounded_solution(w, wt, vt, counts, method=None):
+    """
+    Get solution of bounded knapsack problem
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param counts: number of instances of each element
+    :type counts: list[int]
+    :param method: 'binary', 'deque' or None for automatic
+    :type method: str
+    :return: number of instances taken of each element
+    :rtype: list[int]
+    """
+    pieces = _bounded_pieces(wt, vt, counts)
+    if method is None:
+        method = 'binary' if len(pieces) <= _DEQUE_PASS_COST * len(counts) else 'deque'
+    solution = [0] * len(counts)
+    if method == 'binary':
+        for piece_idx in get_knapsack_0_1_solution_bits(
+                w, [wt[idx] * size for idx, size in pieces],
+                [vt[idx] * size for idx, size in pieces], len(pieces)):
+            idx, size = pieces[piece_idx]
+            solution[idx] += size
+    elif method == 'deque':
+        _, choices = _knapsack_bounded_deque(w, wt, vt, counts, keep_choices=True)
+        w_idx = w
+        for idx in range(len(counts) - 1, -1, -1):
+            solution[idx] = choices[idx][w_idx]
+            w_idx -= solution[idx] * wt[idx]
+    else:
+        raise ValueError('unknown method: {}'.format(method))
+    return solution
+
+
+def preprocess_unbounded_items(w, wt, vt, n):
+    """
+    Shrink an unbounded knapsack problem without changing its answer
+
+    1. Drop items heavier than w or without value, and merge items with
+       the same weight into the most valuable one.
+    2. Drop dominated items: item j is dominated by item i if
+       floor(wt[j] / wt[i]) copies of item i are at least as valuable,
+       which includes items heavier and no more valuable than another.
+    3. Divide all weights by their greatest common divisor, and w as well
+       (rounding down, since the remainder can never be used).
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :return: reduced capacity, weights and values, sorted by weight
+    :rtype: tuple[int, list[int], list[int]]
+    """
+    best = {}
+    for weight, value in zip(wt[:n], vt[:n]):
+        if 0 < weight <= w and value > 0 and value > best.get(weight, 0):
+            best[weight] = value
+    weights, values = [], []
+    for weight in sorted(best):
+        value = best[weight]
+        if all(weight // kept_wt * kept_vt < value
+               for kept_wt, kept_vt in zip(weights, values)):
+            weights.append(weight)
+            values.append(value)
+    divisor = 0
+    for weight in weights:
+        divisor = gcd(weight, divisor)
+    if divisor > 1:
+        w //= divisor
+        weights = [weight // divisor for weight in weights]
+    return w, weights, values
+
+
+def knapsack_unbounded_periodic(w, wt, vt, n):
+    """
+    A solution for unbounded knapsack problem with preprocessing and
+    periodicity
+
+    After `preprocess_unbounded_items`, let b be the item with the best
+    value density. An optimal solution needs less than wt[b] other items,
+    since among wt[b] of them there is always a subset whose total weight
+    is a multiple of wt[b], which can be replaced by copies of b without
+    losing value. So for every capacity c >= wt[b] * (max(wt) + 1),
+    dp[c] = dp[c - wt[b]] + vt[b], and the table only needs to be filled
+    up to that bound whatever the capacity is.
+
+    - Time Complexity: O(n * min(w, wt[b] * max(wt))) after preprocessing
+
+    :param w: total capacity
+    :type w: int
+    :param wt: weight of each element
+    :type wt: list[int]
+    :param vt: value of each element
+    :type vt: list[int]
+    :param n: number of elements
+    :type n: int
+    :return: the maximum value that can be put in a knapsack of capacity w
+    :rtype: int
+    """
+    w, wt, vt = preprocess_unbounded_items(w, wt, vt, n)
+    if len(wt) == 0:
+        return 0
+    best = max(range(len(wt)), key=lambda idx: (vt[idx] / wt[idx], -wt[idx]))
+    bound = wt[best] * (wt[-1] + 1)
+    # number of best items to take before the table
+    skip = 0 if w < bound else (w - bound) // wt[best] + 1
+    w -= skip * wt[best]
+
+    dp = [0] * (w + 1)
+    for weight, value in zip(wt, vt):
+        for w_idx in range(weight, w + 1):
+            if dp[w_idx - weight] + value > dp[w_idx]:
+                dp[w_idx] = dp[w_idx - weight] + value
+    return dp[w] + skip * vt[best]
+
+
 class TestKnapsack(unittest.TestCase):
 
+    @staticmethod
+    def _knapsack_0_1_brute_force(w, wt, vt, n):
+        best = 0
+        for mask in range(1 << n):
+            items = [i for i in range(n) if mask >> i & 1]
+            if sum(wt[i] for i in items) <= w:
+                best = max(best, sum(vt[i] for i in items))
+        return best
+
     def test_knapsack_0_1_recursive(self):
         w = 50
         wt = [10, 20, 30]
@@ -232,6 +1164,115 @@ class TestKnapsack(unittest.TestCase):
         n = len(vt)
         self.assertEqual(220, knapsack_0_1_dp(w, wt, vt, n))
 
+    def test_knapsack_0_1_rolling(self):
+        w = 50
+        wt = [10, 20, 30]
+        vt = [60, 100, 120]
+        n = len(vt)
+        self.assertEqual(220, knapsack_0_1_rolling(w, wt, vt, n))
+        for _ in range(50):
+            n = randint(0, 8)
+            w = randint(0, 40)
+            wt = [randint(0, 15) for _ in range(n)]
+            vt = [randint(0, 30) for _ in range(n)]
+            expected = self._knapsack_0_1_brute_force(w, wt, vt, n)
+            self.assertEqual(expected, knapsack_0_1_rolling(w, wt, vt, n))
+            # the recursive and the dp solution miss zero-weight items
+            # once the capacity is used up
+            if 0 not in wt:
+                self.assertEqual(expected, knapsack_0_1_recursive(w, wt, vt, n))
+                self.assertEqual(expected, knapsack_0_1_dp(w, wt, vt, n))
+        self.assertEqual(8, knapsack_0_1_rolling(0, [5, 0], [16, 8], 2))
+        # values which overflow int64
+        self.assertEqual(2 ** 64 + 2 ** 63, knapsack_0_1_rolling(5, [2, 3], [2 ** 64, 2 ** 63], 2))
+
+    def test_knapsack_0_1_branch_and_bound(self):
+        w = 50
+        wt = [10, 20, 30]
+        vt = [60, 100, 120]
+        n = len(vt)
+        self.assertEqual(220, knapsack_0_1_branch_and_bound(w, wt, vt, n))
+        for _ in range(50):
+            n = randint(0, 12)
+            w = randint(0, 80)
+            wt = [randint(0, 20) for _ in range(n)]
+            vt = [randint(0, 30) for _ in range(n)]
+            self.assertEqual(knapsack_0_1_rolling(w, wt, vt, n),
+                             knapsack_0_1_branch_and_bound(w, wt, vt, n))
+        # larger instance with correlated values, seeded since the running
+        # time of branch and bound has a heavy tail on such instances
+        rng = Random(36)
+        n = 300
+        wt = [rng.randint(1, 100) for _ in range(n)]
+        vt = [x + rng.randint(0, 10) for x in wt]
+        w = sum(wt) // 2
+        self.assertEqual(knapsack_0_1_rolling(w, wt, vt, n),
+                         knapsack_0_1_branch_and_bound(w, wt, vt, n))
+
+    def test_knapsack_0_1_branch_and_bound_bounds(self):
+        for _ in range(50):
+            n = randint(0, 12)
+            w = randint(0, 80)
+            wt = [randint(0, 20) for _ in range(n)]
+            vt = [randint(0, 30) for _ in range(n)]
+            best = knapsack_0_1_rolling(w, wt, vt, n)
+            self.assertTupleEqual((best, best), knapsack_0_1_branch_and_bound_bounds(w, wt, vt, n))
+            for max_nodes in (0, 1, 5):
+                lower, upper = knapsack_0_1_branch_and_bound_bounds(w, wt, vt, n, max_nodes)
+                self.assertLessEqual(lower, best)
+                self.assertLessEqual(best, upper)
+        # strongly correlated instance which is hard to search exhaustively
+        rng = Random(36)
+        n = 2000
+        wt = [rng.randint(10 ** 4, 10 ** 5) for _ in range(n)]
+        vt = [x + 10 ** 3 for x in wt]
+        w = sum(wt) // 2
+        start = time.perf_counter()
+        lower, upper = knapsack_0_1_branch_and_bound_bounds(w, wt, vt, n, time_limit=0.05)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertLessEqual(lower, upper)
+        self.assertLess(upper - lower, upper * 1e-3)
+        lower, upper = knapsack_0_1_branch_and_bound_bounds(w, wt, vt, n, max_nodes=1000)
+        self.assertLessEqual(lower, upper)
+        self.assertEqual(lower, knapsack_0_1_branch_and_bound(w, wt, vt, n, max_nodes=1000))
+
+    def test_knapsack_0_1_fptas(self):
+        for eps in (0.5, 0.1, 0.01):
+            for _ in range(30):
+                n = randint(0, 12)
+                w = randint(0, 80)
+                wt = [randint(0, 20) for _ in range(n)]
+                vt = [randint(0, 1000) for _ in range(n)]
+                best = knapsack_0_1_rolling(w, wt, vt, n)
+                approx = knapsack_0_1_fptas(w, wt, vt, n, eps)
+                self.assertLessEqual(approx, best)
+                self.assertGreaterEqual(approx, (1 - eps) * best)
+
+    def test_knapsack_table(self):
+        wt = [randint(1, 20) for _ in range(12)]
+        vt = [randint(0, 30) for _ in range(12)]
+        table = KnapsackTable(wt[:5], vt[:5], 100)
+        table.add_items(wt[5:], vt[5:])
+        self.assertEqual(12, len(table))
+        for c in range(101):
+            self.assertEqual(knapsack_0_1_dp(c, wt, vt, 12), table[c])
+        # values which overflow int64
+        table = KnapsackTable([2], [2 ** 62], 5)
+        table.add_items([3], [2 ** 62])
+        self.assertEqual(2 ** 63, table.best_value(5))
+
+    def test_solve_many(self):
+        instances = []
+        for _ in range(20):
+            n = randint(0, 8)
+            instances.append((randint(0, 40), [randint(1, 15) for _ in range(n)],
+                              [randint(0, 30) for _ in range(n)], n))
+        expected = [knapsack_0_1_dp(*instance) for instance in instances]
+        self.assertListEqual(expected, solve_many(instances, workers=1))
+        self.assertListEqual(expected, solve_many(instances, workers=2))
+        self.assertListEqual(expected, solve_many(instances, workers=2,
+                                                  solver=knapsack_0_1_branch_and_bound))
+
     def test_get_knapsack_0_1_solution(self):
         w = 50
         wt = [10, 20, 30]
@@ -240,6 +1281,87 @@ class TestKnapsack(unittest.TestCase):
         # print('item indices: ', sorted(get_knapsack_0_1_solution(w, wt, vt, n)))
         self.assertListEqual([2, 1], get_knapsack_0_1_solution(w, wt, vt, n))
 
+    def test_get_knapsack_0_1_solution_hirschberg(self):
+        w = 50
+        wt = [10, 20, 30]
+        vt = [60, 100, 120]
+        n = len(vt)
+        self.assertListEqual([2, 1], get_knapsack_0_1_solution_hirschberg(w, wt, vt, n))
+        self.assertListEqual([2, 1], get_knapsack_0_1_solution_bits(w, wt, vt, n))
+        for _ in range(50):
+            n = randint(0, 10)
+            w = randint(0, 60)
+            wt = [randint(1, 20) for _ in range(n)]
+            vt = [randint(0, 30) for _ in range(n)]
+            expected = get_knapsack_0_1_solution(w, wt, vt, n)
+            self.assertListEqual(expected, get_knapsack_0_1_solution_bits(w, wt, vt, n))
+            solution = get_knapsack_0_1_solution_hirschberg(w, wt, vt, n)
+            self.assertLessEqual(sum(wt[i] for i in solution), w)
+            self.assertEqual(sum(vt[i] for i in expected), sum(vt[i] for i in solution))
+
+    def test_knapsack_0_1_pareto(self):
+        for _ in range(50):
+            n = randint(0, 10)
+            w = randint(0, 60)
+            wt = [randint(1, 20) for _ in range(n)]
+            vt = [randint(0, 30) for _ in range(n)]
+            expected = knapsack_0_1_dp(w, wt, vt, n)
+            self.assertEqual(expected, knapsack_0_1_pareto(w, wt, vt, n))
+            self.assertEqual(expected, knapsack_0_1_meet_in_middle(w, wt, vt, n))
+        # huge capacity
+        w = 10 ** 9
+        wt = [randint(10 ** 7, 10 ** 8) for _ in range(40)]
+        vt = [randint(1, 1000) for _ in range(40)]
+        self.assertEqual(knapsack_0_1_pareto(w, wt, vt, 40),
+                         knapsack_0_1_meet_in_middle(w, wt, vt, 40))
+        # float weights
+        self.assertEqual(220, knapsack_0_1_pareto(5.0, [1.0, 2.0, 3.0], [60, 100, 120], 3))
+        self.assertEqual(220, knapsack_0_1_meet_in_middle(5.0, [1.0, 2.0, 3.0], [60, 100, 120], 3))
+
+    def test_preprocess_unbounded_items(self):
+        w, wt, vt = preprocess_unbounded_items(
+            100, [6, 4, 12, 8, 6, 200, 10], [5, 6, 11, 12, 7, 1000, 0], 7)
+        # 8 and 12 are dominated by copies of 4, the better 6 is kept,
+        # the rest is unusable, then weights are divided by gcd 2
+        self.assertEqual(50, w)
+        self.assertListEqual([2, 3], wt)
+        self.assertListEqual([6, 7], vt)
+
+    def test_knapsack_unbounded_periodic(self):
+        w = 100
+        wt = [5, 10, 15]
+        vt = [10, 30, 20]
+        n = len(vt)
+        self.assertEqual(300, knapsack_unbounded_periodic(w, wt, vt, n))
+        for _ in range(50):
+            n = randint(0, 5)
+            w = randint(0, 300)
+            wt = [randint(1, 12) * 3 for _ in range(n)]
+            vt = [randint(0, 30) for _ in range(n)]
+            self.assertEqual(knapsack_unbounded(w, wt, vt, n),
+                             knapsack_unbounded_periodic(w, wt, vt, n))
+        # huge capacity
+        self.assertEqual(knapsack_unbounded(1000, [7, 11, 13], [20, 32, 38], 3) + 38 * 10 ** 9,
+                         knapsack_unbounded_periodic(1000 + 13 * 10 ** 9,
+                                                     [7, 11, 13], [20, 32, 38], 3))
+
+    def test_knapsack_bounded(self):
+        for _ in range(50):
+            n = randint(0, 6)
+            w = randint(0, 60)
+            wt = [randint(1, 20) for _ in range(n)]
+            vt = [randint(0, 30) for _ in range(n)]
+            counts = [randint(0, 5) for _ in range(n)]
+            # expand into 0-1 items
+            items = [idx for idx in range(n) for _ in range(counts[idx])]
+            expected = knapsack_0_1_dp(w, [wt[i] for i in items], [vt[i] for i in items], len(items))
+            for method in (None, 'binary', 'deque'):
+                self.assertEqual(expected, knapsack_bounded(w, wt, vt, counts, method))
+                solution = get_knapsack_bounded_solution(w, wt, vt, counts, method)
+                self.assertTrue(all(0 <= k <= c for k, c in zip(solution, counts)))
+                self.assertLessEqual(sum(k * x for k, x in zip(solution, wt)), w)
+                self.assertEqual(expected, sum(k * x for k, x in zip(solution, vt)))
+
     def test_knapsack_unbounded(self):
         w = 100
         wt = [5, 10, 15]
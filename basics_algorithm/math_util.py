@@ -6,7 +6,24 @@ Math Utilities
 
 import unittest
 import math
+import mmap
+import os
 import random
+import struct
+import tempfile
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .binary_search import binary_search_lower_bound, binary_search_upper_bound
 
 
 def fast_pow_iterative(x, n, mod=None):
@@ -28,11 +45,13 @@ def fast_pow_iterative(x, n, mod=None):
     :rtype: int
     """
     if mod is not None:
+        # reduce every product to keep the operands below mod
         res = 1 % mod
+        x %= mod
         while n > 0:
             if (n & 1) != 0:
-                res *= x % mod
-            x *= x % mod
+                res = res * x % mod
+            x = x * x % mod
             n >>= 1
     else:
         # in python 3, since there is no longer a limit to
@@ -46,6 +65,158 @@ def fast_pow_iterative(x, n, mod=None):
     return res
 
 
+def mod_pow(x, n, mod, window=None):
+    """
+    Compute x^n % mod by sliding window exponentiation
+
+    The odd powers x, x^3, ..., x^(2^w - 1) are precomputed. Scanning
+    the bits of n from the top, a run of zeros costs only squarings, and
+    every window of at most w bits which starts and ends with a one costs
+    a single multiplication by a precomputed power, so there are about
+    log(n) / (w + 1) multiplications instead of log(n) / 2.
+
+    - Time Complexity: O(log n) modular multiplications
+
+    :param x: given number
+    :type x: int
+    :param n: given non-negative exponential
+    :type n: int
+    :param mod: modulus
+    :type mod: int
+    :param window: window size in bits, chosen by the size of n if not given
+    :type window: int
+    :return: result of x^n % mod
+    :rtype: int
+    """
+    assert n >= 0
+    if window is None:
+        bits = n.bit_length()
+        window = 1 if bits <= 8 else 3 if bits <= 64 else 4 if bits <= 256 else 5
+    x %= mod
+    x_square = x * x % mod
+    odd_powers = [x]
+    for _ in range((1 << (window - 1)) - 1):
+        odd_powers.append(odd_powers[-1] * x_square % mod)
+
+    res = 1 % mod
+    idx = n.bit_length() - 1
+    while idx >= 0:
+        if (n >> idx) & 1 == 0:
+            res = res * res % mod
+            idx -= 1
+            continue
+        # the longest window n[idx:low] of at most w bits ending with a one
+        low = max(idx - window + 1, 0)
+        while (n >> low) & 1 == 0:
+            low += 1
+        for _ in range(idx - low + 1):
+            res = res * res % mod
+        value = (n >> low) & ((1 << (idx - low + 1)) - 1)
+        res = res * odd_powers[value >> 1] % mod
+        idx = low - 1
+    return res
+
+
+class FixedBasePow:
+
+    def __init__(self, base, mod, window=8) -> None:
+        """
+        Modular exponentiation with a fixed base and modulus
+
+        The exponent is split into digits of w bits, and the table
+        table[i][d] = base^(d * 2^(w*i)) % mod is precomputed, so that a
+        power is a product of one table entry per digit, without any
+        squaring. The table grows on demand for longer exponents.
+
+        :param base: fixed base
+        :type base: int
+        :param mod: modulus
+        :type mod: int
+        :param window: digit size in bits
+        :type window: int
+        """
+        super().__init__()
+        self.base = base % mod
+        self.mod = mod
+        self.window = window
+        self._table = []
+        # base^(2^(w*i)) for the next row of table
+        self._next = self.base
+
+    def _extend(self, num_digits):
+        """
+        Extend table to cover exponents with the given number of digits
+
+        :param num_digits: number of w-bit digits
+        :type num_digits: int
+        """
+        mod = self.mod
+        while len(self._table) < num_digits:
+            row = [1 % mod]
+            for _ in range((1 << self.window) - 1):
+                row.append(row[-1] * self._next % mod)
+            self._table.append(row)
+            self._next = row[-1] * self._next % mod
+
+    def pow(self, n):
+        """
+        Compute base^n % mod
+
+        :param n: given non-negative exponential
+        :type n: int
+        :return: result of base^n % mod
+        :rtype: int
+        """
+        assert n >= 0
+        self._extend(-(-n.bit_length() // self.window))
+        mask = (1 << self.window) - 1
+        res = 1 % self.mod
+        for row in self._table:
+            if n == 0:
+                break
+            digit = n & mask
+            if digit:
+                res = res * row[digit] % self.mod
+            n >>= self.window
+        return res
+
+    def __call__(self, n):
+        return self.pow(n)
+
+
+def pow_many(base, exponents, mod):
+    """
+    Compute base^n % mod for each of the given exponents
+
+    If NumPy is available and (mod - 1)^2 fits in int64, the square and
+    multiply loop runs over the whole array of exponents at once.
+    Otherwise the table of `FixedBasePow` is shared by all exponents.
+
+    :param base: given number
+    :type base: int
+    :param exponents: given non-negative exponentials
+    :type exponents: list[int]
+    :param mod: modulus
+    :type mod: int
+    :return: result of base^n % mod for each exponent
+    :rtype: list[int]
+    """
+    exponents = list(exponents)
+    if np is not None and (mod - 1) ** 2 < 2 ** 63 and \
+            all(0 <= n < 2 ** 63 for n in exponents):
+        remaining = np.array(exponents, dtype=np.int64)
+        res = np.full(len(exponents), 1 % mod, dtype=np.int64)
+        power = base % mod
+        while remaining.any():
+            odd = (remaining & 1) == 1
+            res[odd] = res[odd] * power % mod
+            power = power * power % mod
+            remaining >>= 1
+        return [int(x) for x in res]
+    fixed_base = FixedBasePow(base, mod)
+    return [fixed_base.pow(n) for n in exponents]
+
+
 def fast_pow_recursive(x, n):
     """
     This method divides the power problem into sub-problems of size n/2
@@ -75,6 +246,151 @@ def fast_pow_recursive(x, n):
         return tmp * tmp / x
 
 
+def _matmul(a, b, mod=None):
+    """
+    Multiply two square matrices
+
+    :param a: the first matrix
+    :type a: list[list[int]] or numpy.ndarray
+    :param b: the second matrix
+    :type b: list[list[int]] or numpy.ndarray
+    :param mod: modulus, None for no modulus
+    :type mod: int
+    :return: product of a and b
+    :rtype: list[list[int]] or numpy.ndarray
+    """
+    if np is not None and isinstance(a, np.ndarray):
+        res = a @ b
+        return res if mod is None else res % mod
+    cols = list(zip(*b))
+    res = [[sum(x * y for x, y in zip(row, col)) for col in cols] for row in a]
+    if mod is not None:
+        res = [[x % mod for x in row] for row in res]
+    return res
+
+
+def matpow(matrix, n, mod=None):
+    """
+    Compute the n-th power of a square matrix by binary exponentiation,
+    in the same way as `fast_pow_iterative`
+
+    The multiplications are done by NumPy in int64 if a modulus is given
+    and k * (mod - 1)^2 fits in int64, so that no product can overflow.
+    Otherwise exact Python integers are used.
+
+    - Time Complexity: O(k^3 log n) for a k*k matrix
+
+    :param matrix: given square matrix
+    :type matrix: list[list[int]]
+    :param n: given non-negative exponential
+    :type n: int
+    :param mod: modulus, None for no modulus
+    :type mod: int
+    :return: result of pow
+    :rtype: list[list[int]]
+    """
+    assert n >= 0
+    k = len(matrix)
+    one = 1 if mod is None else 1 % mod
+    res = [[one if i == j else 0 for j in range(k)] for i in range(k)]
+    base = [[x if mod is None else x % mod for x in row] for row in matrix]
+    if np is not None and mod is not None and k * (mod - 1) ** 2 < 2 ** 63:
+        res = np.array(res, dtype=np.int64)
+        base = np.array(base, dtype=np.int64)
+    while n > 0:
+        if (n & 1) != 0:
+            res = _matmul(res, base, mod)
+        base = _matmul(base, base, mod)
+        n >>= 1
+    return [[int(x) for x in row] for row in res]
+
+
+def linear_recurrence_nth(coeffs, init, n, mod=None):
+    """
+    Get the n-th term of a linear recurrence by matrix fast exponentiation
+
+    For a[i] = coeffs[0] * a[i-1] + ... + coeffs[k-1] * a[i-k], the state
+    (a[i], ..., a[i-k+1]) is multiplied by the companion matrix to move
+    one step forward, so a[n] is read from its (n-k+1)-th power.
+
+    - Time Complexity: O(k^3 log n)
+
+    :param coeffs: coefficients of the recurrence
+    :type coeffs: list[int]
+    :param init: the first k terms a[0], ..., a[k-1]
+    :type init: list[int]
+    :param n: index of the term
+    :type n: int
+    :param mod: modulus, None for no modulus
+    :type mod: int
+    :return: the n-th term a[n]
+    :rtype: int
+    """
+    k = len(coeffs)
+    assert len(init) == k
+    if n < k:
+        return init[n] if mod is None else init[n] % mod
+    companion = [list(coeffs)] + [[1 if j == i else 0 for j in range(k)]
+                                  for i in range(k - 1)]
+    power = matpow(companion, n - k + 1, mod)
+    res = sum(x * y for x, y in zip(power[0], reversed(init)))
+    return res if mod is None else res % mod
+
+
+def linear_recurrence_nth_kitamasa(coeffs, init, n, mod=None):
+    """
+    Get the n-th term of a linear recurrence by Kitamasa's method
+
+    With the characteristic polynomial P(x) = x^k - coeffs[0] * x^(k-1)
+    - ... - coeffs[k-1], if x^n = r[0] + r[1] * x + ... + r[k-1] * x^(k-1)
+    modulo P(x), then a[n] = r[0] * a[0] + ... + r[k-1] * a[k-1]. The
+    remainder is computed by binary exponentiation of polynomials, each
+    step being a product and a reduction in O(k^2).
+
+    - Time Complexity: O(k^2 log n)
+
+    :param coeffs: coefficients of the recurrence
+    :type coeffs: list[int]
+    :param init: the first k terms a[0], ..., a[k-1]
+    :type init: list[int]
+    :param n: index of the term
+    :type n: int
+    :param mod: modulus, None for no modulus
+    :type mod: int
+    :return: the n-th term a[n]
+    :rtype: int
+    """
+    k = len(coeffs)
+    assert len(init) == k
+    if n < k:
+        return init[n] if mod is None else init[n] % mod
+
+    def mulmod(a, b):
+        prod = [0] * (2 * k - 1)
+        for i, x in enumerate(a):
+            if x:
+                for j, y in enumerate(b):
+                    prod[i + j] += x * y
+        # x^d = sum(coeffs[i] * x^(d-1-i)) for d >= k
+        for d in range(2 * k - 2, k - 1, -1):
+            if prod[d]:
+                for i, c in enumerate(coeffs):
+                    prod[d - 1 - i] += prod[d] * c
+        return [x % mod for x in prod[:k]] if mod is not None else prod[:k]
+
+    one = 1 if mod is None else 1 % mod
+    res = [one] + [0] * (k - 1)
+    # x modulo P(x)
+    base = [0, 1] + [0] * (k - 2) if k > 1 else [coeffs[0]]
+    while n > 0:
+        if (n & 1) != 0:
+            res = mulmod(res, base)
+        base = mulmod(base, base)
+        n >>= 1
+    res = sum(x * y for x, y in zip(res, init))
+    return res if mod is None else res % mod
+
+
 def gcd(a, b):
     """
     Get greatest common divisor of given number a and b
@@ -86,7 +402,11 @@ def gcd(a, b):
     :return: greatest common divisor
     :rtype: int
     """
-    return gcd(b, a % b) if b != 0 else a
+    # iterative Euclidean algorithm, which does not hit the recursion
+    # limit on consecutive Fibonacci numbers
+    while b != 0:
+        a, b = b, a % b
+    return a
 
 
 def lcm(a, b):
@@ -100,7 +420,145 @@ def lcm(a, b):
     :return: least common multiple
     :rtype: int
     """
-    return a * b // gcd(a, b)
+    if a == 0 or b == 0:
+        return 0
+    # divide before multiplying to keep the intermediate small
+    return a // gcd(a, b) * b
+
+
+def binary_gcd(a, b):
+    """
+    Get greatest common divisor of given number a and b by binary GCD
+    (Stein's algorithm)
+
+    It only uses shifts and subtractions: the common factor 2^k is taken
+    out first, then the smaller number is repeatedly subtracted from the
+    larger one, which is made odd again by shifting out its trailing zeros.
+
+    :param a: the first given number
+    :type a: int
+    :param b: the second given number
+    :type b: int
+    :return: greatest common divisor
+    :rtype: int
+    """
+    a, b = abs(a), abs(b)
+    if a == 0 or b == 0:
+        return a | b
+    # number of trailing zeros of a | b
+    shift = ((a | b) & -(a | b)).bit_length() - 1
+    a >>= (a & -a).bit_length() - 1
+    while b != 0:
+        b >>= (b & -b).bit_length() - 1
+        if a > b:
+            a, b = b, a
+        b -= a
+    return a << shift
+
+
+def ext_gcd(a, b):
+    """
+    Get greatest common divisor g of given number a and b, and the
+    coefficients x and y where a*x + b*y = g by extended Euclidean algorithm
+
+    :param a: the first given number
+    :type a: int
+    :param b: the second given number
+    :type b: int
+    :return: g, x and y
+    :rtype: tuple[int, int, int]
+    """
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b != 0:
+        q = a // b
+        a, b = b, a - q * b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+
+def mod_inverse(a, mod):
+    """
+    Get modular multiplicative inverse of a, i.e. x where a*x % mod == 1
+
+    :param a: the given number
+    :type a: int
+    :param mod: modulus
+    :type mod: int
+    :return: inverse of a in [0, mod)
+    :rtype: int
+    """
+    g, x, _ = ext_gcd(a % mod, mod)
+    if g != 1:
+        raise ValueError('{} is not invertible modulo {}'.format(a, mod))
+    return x % mod
+
+
+def batch_mod_inverse(values, mod):
+    """
+    Get modular multiplicative inverses of all given numbers by
+    Montgomery's trick
+
+    With prefix products p[i] = a[0] * ... * a[i], only p[k-1] is
+    inverted, then walking backwards 1/a[i] = 1/p[i] * p[i-1] and
+    1/p[i-1] = 1/p[i] * a[i]. So k inverses cost one inverse and about
+    3k multiplications.
+
+    :param values: the given numbers, all coprime to mod
+    :type values: list[int]
+    :param mod: modulus
+    :type mod: int
+    :return: inverse of each number in [0, mod)
+    :rtype: list[int]
+    """
+    values = list(values)
+    if len(values) == 0:
+        return []
+    prefix = [values[0] % mod]
+    for value in values[1:]:
+        prefix.append(prefix[-1] * value % mod)
+    inverse = mod_inverse(prefix[-1], mod)
+    res = [0] * len(values)
+    for idx in range(len(values) - 1, 0, -1):
+        res[idx] = inverse * prefix[idx - 1] % mod
+        inverse = inverse * values[idx] % mod
+    res[0] = inverse
+    return res
+
+
+def gcd_many(values):
+    """
+    Get greatest common divisor of all given numbers
+
+    :param values: the given numbers
+    :type values: Iterable[int]
+    :return: greatest common divisor, 0 for no number
+    :rtype: int
+    """
+    res = 0
+    for value in values:
+        res = math.gcd(res, value)
+        if res == 1:
+            break
+    return res
+
+
+def lcm_many(values):
+    """
+    Get least common multiple of all given numbers, dividing by the gcd
+    before multiplying
+
+    :param values: the given numbers
+    :type values: Iterable[int]
+    :return: least common multiple, 1 for no number
+    :rtype: int
+    """
+    res = 1
+    for value in values:
+        if value == 0:
+            return 0
+        res = res // math.gcd(res, value) * abs(value)
+    return res
 
 
 def is_prime(n):
@@ -112,7 +570,7 @@ def is_prime(n):
     :return: whether the given number is prime
     :rtype: bool
     """
-    for i in range(2, int(math.sqrt(n))):
+    for i in range(2, math.isqrt(n) + 1):
         if n % i == 0:
             return False
     return n > 1
@@ -163,16 +621,930 @@ def sieve_range(lb, ub):
     return prime_numebrs
 
 
+def _odd_primes(n):
+    """
+    Get odd prime numbers in the range of [3, n] by the sieve of
+    Eratosthenes over odd numbers only
+
+    :param n: the given number
+    :type n: int
+    :return: odd prime numbers in the range of [3, n]
+    :rtype: array
+    """
+    if n < 3:
+        return array('Q')
+    # flags[i] stands for 2i+1
+    flags = bytearray(b'\x01') * ((n + 1) // 2)
+    flags[0] = 0
+    for i in range(1, (math.isqrt(n) + 1) // 2):
+        if flags[i]:
+            p = 2 * i + 1
+            # strike odd multiples starting from p^2
+            flags[p * p // 2::p] = bytes(len(range(p * p // 2, len(flags), p)))
+    return array('Q', compress(range(1, n + 1, 2), flags))
+
+
+def _sieve_odd_window(lo, size, base_primes):
+    """
+    Sieve a window of odd numbers lo, lo + 2, ..., lo + 2 * (size - 1)
+
+    :param lo: the first odd number of window, at least 3
+    :type lo: int
+    :param size: number of odd numbers in window
+    :type size: int
+    :param base_primes: odd prime numbers in ascending order, covering
+                        the square root of the last number
+    :type base_primes: array
+    :return: flags where flags[i] tells whether lo + 2i is prime
+    :rtype: bytearray
+    """
+    hi = lo + 2 * size
+    flags = bytearray(b'\x01') * size
+    for p in base_primes:
+        start = p * p
+        if start >= hi:
+            break
+        if start < lo:
+            start = lo + (-lo) % p
+            if start % 2 == 0:
+                start += p
+        idx = (start - lo) // 2
+        flags[idx::p] = bytes(len(range(idx, size, p)))
+    return flags
+
+
+def segmented_sieve(lb, ub, segment_size=1 << 18, base_primes=None):
+    """
+    Generate prime numbers in the range of [lb, ub] by the segmented sieve
+    of Eratosthenes
+
+    The base primes up to sqrt(ub) are sieved first. Then the range is
+    processed in windows of segment_size odd numbers, each a bytearray
+    small enough to stay in cache. For each base prime p, its odd
+    multiples are struck with one slice assignment, starting from
+    max(p^2, the first odd multiple in the window).
+
+    - Time Complexity: O((ub - lb) log log ub + sqrt(ub))
+    - Space Complexity: O(sqrt(ub) + segment_size)
+
+    :param lb: lower bound of range
+    :type lb: int
+    :param ub: upper bound of range
+    :type ub: int
+    :param segment_size: number of odd numbers in a window, one byte each,
+                         fit it to the L1/L2 cache
+    :type segment_size: int
+    :param base_primes: precomputed odd prime numbers up to at least
+                        sqrt(ub), sieved here if not given
+    :type base_primes: array
+    :return: prime numbers in the range of [lb, ub] in ascending order
+    :rtype: Iterator[int]
+    """
+    if ub < max(lb, 2):
+        return
+    if lb <= 2:
+        yield 2
+    # the first odd number in range
+    lo = max(lb, 3) | 1
+    if base_primes is None:
+        base_primes = _odd_primes(math.isqrt(ub))
+    while lo <= ub:
+        size = min(segment_size, (ub - lo) // 2 + 1)
+        hi = lo + 2 * size
+        # flags[i] stands for lo + 2i
+        flags = _sieve_odd_window(lo, size, base_primes)
+        yield from compress(range(lo, hi, 2), flags)
+        lo = hi
+
+
+_SMALL_PRIMES = (2,) + tuple(_odd_primes(1000))
+_SMALL_PRIME_PRODUCT = math.prod(_SMALL_PRIMES)
+# witnesses that make Miller-Rabin deterministic for n < 2^64
+_MILLER_RABIN_BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+
+def _miller_rabin(n, bases):
+    """
+    Strong probable prime test of odd n > 2 to given bases
+
+    :param n: the given odd number
+    :type n: int
+    :param bases: bases to test
+    :type bases: tuple[int]
+    :return: whether n is a strong probable prime to all bases
+    :rtype: bool
+    """
+    # n - 1 = d * 2^s with odd d
+    s = ((n - 1) & (1 - n)).bit_length() - 1
+    d = (n - 1) >> s
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _jacobi(a, n):
+    """
+    Get Jacobi symbol (a/n) of odd positive n
+
+    :param a: the given number
+    :type a: int
+    :param n: the given odd number
+    :type n: int
+    :return: Jacobi symbol, in {-1, 0, 1}
+    :rtype: int
+    """
+    a %= n
+    res = 1
+    while a != 0:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                res = -res
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            res = -res
+        a %= n
+    return res if n == 1 else 0
+
+
+def _strong_lucas(n):
+    """
+    Strong Lucas probable prime test of odd n > 2 with the parameters
+    chosen by Selfridge's method A
+
+    :param n: the given odd number, not a perfect square
+    :type n: int
+    :return: whether n is a strong Lucas probable prime
+    :rtype: bool
+    """
+    # D in 5, -7, 9, -11, ... with (D/n) = -1
+    d = 5
+    while True:
+        jacobi = _jacobi(d, n)
+        if jacobi == -1:
+            break
+        if jacobi == 0 and abs(d) != n:
+            return False
+        d = -d - 2 if d > 0 else -d + 2
+    p, q = 1, (1 - d) // 4
+
+    def halve(x):
+        return (x + n if x % 2 else x) // 2 % n
+
+    # n + 1 = k * 2^s with odd k, compute U_k, V_k and Q^k by doubling
+    s = ((n + 1) & -(n + 1)).bit_length() - 1
+    k = (n + 1) >> s
+    u, v, q_k = 1, p, q % n
+    for bit in bin(k)[3:]:
+        u, v, q_k = u * v % n, (v * v - 2 * q_k) % n, q_k * q_k % n
+        if bit == '1':
+            u, v, q_k = halve(p * u + v), halve(d * u + p * v), q_k * q % n
+    if u == 0 or v == 0:
+        return True
+    for _ in range(s - 1):
+        v, q_k = (v * v - 2 * q_k) % n, q_k * q_k % n
+        if v == 0:
+            return True
+    return False
+
+
+def baillie_psw(n):
+    """
+    Check whether the given number is prime by Baillie-PSW test
+
+    It is a Miller-Rabin test to base 2 followed by a strong Lucas test.
+    No composite number passing both is known, and none exists below 2^64.
+
+    :param n: the given number
+    :type n: int
+    :return: whether the given number is (probably) prime
+    :rtype: bool
+    """
+    if n < 2:
+        return False
+    if math.gcd(n, _SMALL_PRIME_PRODUCT) != 1:
+        return n in _SMALL_PRIMES
+    if n < _SMALL_PRIMES[-1] ** 2:
+        return True
+    if math.isqrt(n) ** 2 == n:
+        return False
+    return _miller_rabin(n, (2,)) and _strong_lucas(n)
+
+
+def is_prime_miller_rabin(n):
+    """
+    Check whether the given number is prime by Miller-Rabin test
+
+    Numbers with a prime factor below 1000 are filtered out by a single
+    gcd with the product of those primes. For n < 2^64 the test with the
+    7 known bases is deterministic, larger n are tested by Baillie-PSW.
+
+    - Time Complexity: O(log^3 n)
+
+    :param n: the given number
+    :type n: int
+    :return: whether the given number is prime
+    :rtype: bool
+    """
+    if n < 2:
+        return False
+    if math.gcd(n, _SMALL_PRIME_PRODUCT) != 1:
+        return n in _SMALL_PRIMES
+    if n < _SMALL_PRIMES[-1] ** 2:
+        return True
+    if n < 1 << 64:
+        return _miller_rabin(n, _MILLER_RABIN_BASES_64)
+    return baillie_psw(n)
+
+
+def is_prime_many(values):
+    """
+    Check whether each of the given numbers is prime
+
+    :param values: the given numbers
+    :type values: Iterable[int]
+    :return: whether each number is prime
+    :rtype: list[bool]
+    """
+    return list(map(is_prime_miller_rabin, values))
+
+
+def _parallel_sieve_segment(args):
+    """
+    Sieve one segment in a worker process with the shared base primes
+
+    :param args: name of shared memory, number of base primes, lower and
+                 upper bound of segment, and whether to count only
+    :type args: tuple
+    :return: number of primes or primes in the segment
+    :rtype: int or array
+    """
+    name, num_base_primes, lb, ub, count_only = args
+    shm = shared_memory.SharedMemory(name=name)
+    base_primes = shm.buf[:num_base_primes * 8].cast('Q')
+    try:
+        if not count_only:
+            return array('Q', segmented_sieve(lb, ub, base_primes=base_primes))
+        count = 1 if lb <= 2 <= ub else 0
+        lo = max(lb, 3) | 1
+        while lo <= ub:
+            size = min(1 << 18, (ub - lo) // 2 + 1)
+            count += _sieve_odd_window(lo, size, base_primes).count(1)
+            lo += 2 * size
+        return count
+    finally:
+        base_primes.release()
+        shm.close()
+
+
+def parallel_sieve(lb, ub, workers=None, count_only=False, segment_size=1 << 21):
+    """
+    Get prime numbers in the range of [lb, ub] by the segmented sieve
+    running on a process pool
+
+    The base primes up to sqrt(ub) are sieved once and put into shared
+    memory, which every worker maps instead of receiving a copy. The range
+    is split into fixed-size segments which are sieved independently. At
+    most 2 segments per worker are in flight, and their results are
+    yielded in the order of segments, so the memory used does not grow
+    with the range.
+
+    :param lb: lower bound of range
+    :type lb: int
+    :param ub: upper bound of range
+    :type ub: int
+    :param workers: number of worker processes, None for the number of CPUs
+    :type workers: int
+    :param count_only: return number of primes of each segment instead of
+                       the primes
+    :type count_only: bool
+    :param segment_size: numbers in each segment, the primes of a segment
+                         are the unit of work sent back by a worker
+    :type segment_size: int
+    :return: prime numbers in the range of [lb, ub] in ascending order, or
+             (lower bound, upper bound, number of primes) of each segment
+    :rtype: Iterator[int] or list[tuple[int, int, int]]
+    """
+    workers = workers or os.cpu_count() or 1
+    lb = max(lb, 0)
+    segments = ((lo, min(lo + segment_size - 1, ub)) for lo in range(lb, ub + 1, segment_size))
+
+    def run():
+        # the shared memory lives only while the results are consumed, so
+        # that a stream dropped before iteration never allocates it
+        base_primes = _odd_primes(math.isqrt(max(ub, 0)))
+        shm = shared_memory.SharedMemory(create=True, size=max(len(base_primes) * 8, 1))
+        try:
+            shm.buf[:len(base_primes) * 8] = base_primes.tobytes()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                for lo, hi in segments:
+                    pending.append((lo, hi, executor.submit(
+                        _parallel_sieve_segment, (shm.name, len(base_primes), lo, hi, count_only))))
+                    if len(pending) >= 2 * workers:
+                        lo, hi, future = pending.popleft()
+                        yield lo, hi, future.result()
+                while pending:
+                    lo, hi, future = pending.popleft()
+                    yield lo, hi, future.result()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    if count_only:
+        return list(run())
+    return (p for _, _, segment_primes in run() for p in segment_primes)
+
+
+def benchmark_parallel_sieve(ub=10 ** 9, workers_list=(1, 2, 4, 8)):
+    """
+    Measure counting primes in [0, ub] by `parallel_sieve` with different
+    numbers of workers
+
+    :param ub: upper bound of range
+    :type ub: int
+    :param workers_list: numbers of workers to benchmark with
+    :type workers_list: tuple[int]
+    :return: seconds for each number of workers
+    :rtype: dict[int, float]
+    """
+    results = {}
+    for workers in workers_list:
+        start = time.perf_counter()
+        count = sum(c for _, _, c in parallel_sieve(0, ub, workers, count_only=True))
+        results[workers] = time.perf_counter() - start
+        print('workers = {}: {} primes in {:.3f}s, speedup {:.2f}x'.format(
+            workers, count, results[workers], results[workers_list[0]] / results[workers]))
+    return results
+
+
+def smallest_prime_factors(n):
+    """
+    Get table of the smallest prime factor of every number in [0, n]
+
+    Multiples of each prime p from p^2 are set to p by slice assignment,
+    going through the primes in descending order so that the smaller
+    prime factors overwrite the larger ones.
+
+    :param n: the given number
+    :type n: int
+    :return: table where table[i] is the smallest prime factor of i,
+             and i itself for i < 2 or prime i
+    :rtype: array
+    """
+    table = array('I', range(n + 1))
+    base_primes = [2] + list(_odd_primes(math.isqrt(n)))
+    for p in reversed(base_primes):
+        table[p * p::p] = array('I', [p]) * len(range(p * p, n + 1, p))
+    return table
+
+
+_SPF_TABLE = array('I')
+
+
+def _pollard_brent(n):
+    """
+    Find a non-trivial factor of odd composite n by Brent's variant of
+    Pollard's rho algorithm
+
+    :param n: the given odd composite number
+    :type n: int
+    :return: a factor d of n where 1 < d < n
+    :rtype: int
+    """
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                # accumulate products to take one gcd per m steps
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # backtrack one step at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def factorize(n, table_bound=1 << 20):
+    """
+    Get prime factorization of the given number
+
+    Numbers below table_bound are factorized by looking up the table of
+    smallest prime factors, which is built once and kept. Larger numbers
+    are stripped of prime factors below 1000 by trial division, and the
+    remaining part is split by Pollard-Brent rho until every part is
+    either a prime by Miller-Rabin or below table_bound. A table kept from
+    a call with a larger bound is reused, but only below table_bound, so
+    the path a number takes does not depend on earlier calls.
+
+    :param n: the given positive number
+    :type n: int
+    :param table_bound: bound of the table of smallest prime factors
+    :type table_bound: int
+    :return: exponent of each prime factor, in ascending order of primes
+    :rtype: dict[int, int]
+    """
+    global _SPF_TABLE
+    assert n >= 1
+    if len(_SPF_TABLE) < table_bound:
+        _SPF_TABLE = smallest_prime_factors(table_bound - 1)
+    table = _SPF_TABLE
+
+    factors = {}
+    if n >= table_bound:
+        for p in _SMALL_PRIMES:
+            while n % p == 0:
+                factors[p] = factors.get(p, 0) + 1
+                n //= p
+    parts = [n]
+    while parts:
+        m = parts.pop()
+        if m < table_bound:
+            while m > 1:
+                p = table[m]
+                factors[p] = factors.get(p, 0) + 1
+                m //= p
+        elif is_prime_miller_rabin(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _pollard_brent(m)
+            parts.append(d)
+            parts.append(m // d)
+    return dict(sorted(factors.items()))
+
+
+def factorize_range(lo, hi):
+    """
+    Get prime factorizations of all numbers in the range of [lo, hi]
+
+    Like the segmented sieve, every base prime p up to sqrt(hi) visits
+    only its multiples in the range and divides them out. What remains
+    of each number after that is either 1 or a single prime factor.
+
+    - Time Complexity: O((hi - lo) log log hi + sqrt(hi))
+
+    :param lo: lower bound of range, at least 1
+    :type lo: int
+    :param hi: upper bound of range
+    :type hi: int
+    :return: factorization of each number in the range as `factorize`
+    :rtype: list[dict[int, int]]
+    """
+    assert lo >= 1
+    rest = list(range(lo, hi + 1))
+    factorizations = [{} for _ in rest]
+    for p in [2] + list(_odd_primes(math.isqrt(hi))):
+        for idx in range((-lo) % p, len(rest), p):
+            exponent = 0
+            while rest[idx] % p == 0:
+                rest[idx] //= p
+                exponent += 1
+            factorizations[idx][p] = exponent
+    for idx, m in enumerate(rest):
+        if m > 1:
+            factorizations[idx][m] = 1
+    return factorizations
+
+
+def divisor_count(n):
+    """
+    Get number of positive divisors of the given number
+
+    :param n: the given positive number
+    :type n: int
+    :return: number of divisors
+    :rtype: int
+    """
+    return math.prod(exponent + 1 for exponent in factorize(n).values())
+
+
+def totient(n):
+    """
+    Get Euler's totient of the given number, i.e. number of integers in
+    [1, n] which are coprime to n
+
+    :param n: the given positive number
+    :type n: int
+    :return: Euler's totient of n
+    :rtype: int
+    """
+    for p in factorize(n):
+        n -= n // p
+    return n
+
+
+# primes below 2^31, so that a residue times a residue fits in int64
+_LUCY_MODULI = (2147483647, 2147483629, 2147483587, 2147483579)
+
+
+def _lucy_hedgehog_numpy(n, power, mod=None):
+    """
+    Lucy_Hedgehog's method with whole-array NumPy updates in int64
+
+    The updates only add, subtract and multiply, so they are exact modulo
+    2^64 even if int64 wraps around.
+
+    :param n: the given number, at least 2
+    :type n: int
+    :param power: 0 for counting and 1 for summing primes
+    :type power: int
+    :param mod: compute everything modulo mod, which is below 2^31, None
+                for modulo 2^64
+    :type mod: int
+    :return: sum of p^power over prime numbers no more than n, modulo mod
+             or 2^64
+    :rtype: int
+    """
+    r = math.isqrt(n)
+
+    def initial(v):
+        value = v - 1 if power == 0 else v * (v + 1) // 2 - 1
+        # as the int64 which is congruent modulo 2^64
+        return value % mod if mod is not None else (value + 2 ** 63) % 2 ** 64 - 2 ** 63
+
+    small = np.array([0] + [initial(v) for v in range(1, r + 1)], dtype=np.int64)
+    large = np.array([0] + [initial(n // i) for i in range(1, r + 1)], dtype=np.int64)
+    with np.errstate(over='ignore'):
+        for p in segmented_sieve(2, r):
+            sp, p2, fp = int(small[p - 1]), p * p, p ** power
+            if mod is not None:
+                fp %= mod
+            lim = min(r, n // p2)
+            d = np.arange(1, lim + 1, dtype=np.int64) * p
+            prev = np.where(d <= r, large[np.minimum(d, r)], small[np.minimum(n // d, r)])
+            large[1:lim + 1] -= fp * (prev - sp)
+            small[p2:] -= fp * (small[np.arange(p2, r + 1) // p] - sp)
+            if mod is not None:
+                large[1:lim + 1] %= mod
+                small[p2:] %= mod
+    return int(large[1]) % (2 ** 64 if mod is None else mod)
+
+
+def _lucy_hedgehog(n, power):
+    """
+    Get sum of p^power over prime numbers p in [2, n] by Lucy_Hedgehog's
+    method
+
+    Let S(v) be the sum of k^power over k in [2, v] which are primes or
+    have no prime factor below the current prime. Only S(v) for v in
+    {n // i} matters, which are at most 2*sqrt(n) values, kept in two
+    arrays: small[v] for v <= sqrt(n) and large[i] for v = n // i. Sieving
+    out each prime p <= sqrt(n) is
+
+        S(v) -= p^power * (S(v // p) - S(p - 1))  for v >= p^2
+
+    and every update reads values of the previous round, so it is done
+    with NumPy as whole-array operations in int64, which gives the result
+    modulo 2^64. That is exact while the result is below 2^64, as bounded
+    by pi(n) < 1.26 n / ln n, e.g. prime sums up to n of about 1.8e10.
+    Beyond that, the method is run again modulo primes below 2^31 and the
+    result is reconstructed by the Chinese remainder theorem. Without NumPy
+    the updates are Python loops, which are tens of times slower.
+
+    :param n: the given number
+    :type n: int
+    :param power: 0 for counting and 1 for summing primes
+    :type power: int
+    :return: sum of p^power over prime numbers no more than n
+    :rtype: int
+    """
+    if n < 2:
+        return 0
+    r = math.isqrt(n)
+
+    def initial(v):
+        return v - 1 if power == 0 else v * (v + 1) // 2 - 1
+
+    if np is not None:
+        # upper bound of the result
+        bound = min(initial(n), math.ceil(1.26 * n ** (power + 1) / math.log(n)))
+        result, modulus = _lucy_hedgehog_numpy(n, power), 2 ** 64
+        for mod in _LUCY_MODULI:
+            if modulus > bound:
+                return result
+            # combine the residues by CRT
+            residue = _lucy_hedgehog_numpy(n, power, mod)
+            result += modulus * ((residue - result) * mod_inverse(modulus, mod) % mod)
+            modulus *= mod
+        if modulus > bound:
+            return result
+        raise OverflowError('n = {} is too large'.format(n))
+
+    make_row = (lambda values: array('q', values)) if initial(n) < 2 ** 63 else list
+    small = make_row([0] + [initial(v) for v in range(1, r + 1)])
+    large = make_row([0] + [initial(n // i) for i in range(1, r + 1)])
+    for p in segmented_sieve(2, r):
+        sp, p2, fp = small[p - 1], p * p, p ** power
+        for i in range(1, min(r, n // p2) + 1):
+            d = i * p
+            large[i] -= fp * ((large[d] if d <= r else small[n // d]) - sp)
+        for v in range(r, p2 - 1, -1):
+            small[v] -= fp * (small[v // p] - sp)
+    return large[1]
+
+
+def prime_count(n):
+    """
+    Get number of prime numbers in the range of [0, n], i.e. pi(n), by
+    Lucy_Hedgehog's method
+
+    - Time Complexity: O(n^(3/4))
+    - Space Complexity: O(sqrt(n))
+
+    :param n: the given number
+    :type n: int
+    :return: number of prime numbers no more than n
+    :rtype: int
+    """
+    return _lucy_hedgehog(n, 0)
+
+
+def prime_sum(n):
+    """
+    Get sum of prime numbers in the range of [0, n] by Lucy_Hedgehog's
+    method
+
+    - Time Complexity: O(n^(3/4))
+    - Space Complexity: O(sqrt(n))
+
+    :param n: the given number
+    :type n: int
+    :return: sum of prime numbers no more than n
+    :rtype: int
+    """
+    return _lucy_hedgehog(n, 1)
+
+
+def primes():
+    """
+    Generate all prime numbers in ascending order without bound
+
+    The segmented sieve is run over windows which double in size, so the
+    base primes are recomputed only O(log n) times.
+
+    :return: prime numbers
+    :rtype: Iterator[int]
+    """
+    lo, hi = 0, 1 << 16
+    while True:
+        yield from segmented_sieve(lo, hi)
+        lo, hi = hi + 1, 2 * hi
+
+
+# magic, limit and number of primes of a persisted table
+_CACHE_HEADER = struct.Struct('8sQQ')
+_CACHE_MAGIC = b'PRIMES02'
+
+
+class PrimeCache:
+
+    def __init__(self, path=None) -> None:
+        """
+        Growable table of prime numbers
+
+        The table holds all primes up to a limit and is extended by the
+        segmented sieve (at least doubling the limit) whenever a query goes
+        beyond it. Queries are answered by binary search over the table.
+
+        If path is given, the table is persisted to that file as a header
+        of the limit and the number of primes, followed by the primes, all
+        as native unsigned 64-bit integers. An existing file is
+        memory-mapped instead of being read, so that opening a large cache
+        is instant. New primes are appended and synced before the header is
+        updated, so an interrupted extension leaves only unused bytes after
+        the table. A missing or empty file is no cache, while any other
+        file without a valid header is rejected rather than overwritten.
+
+        :param path: path of file to persist the table, None for memory only
+        :type path: str
+        :raises ValueError: if a non-empty file at path is not a prime cache
+        """
+        super().__init__()
+        self.path = path
+        self._limit = 1
+        self._table = array('Q')
+        self._mm = None
+        if path is not None and os.path.exists(path):
+            self._map()
+
+    def _map(self):
+        """
+        Memory-map the persisted table, unless the file is empty
+
+        :raises ValueError: if the file does not hold a valid table
+        """
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            if size < _CACHE_HEADER.size:
+                raise ValueError('{} is not a prime cache'.format(self.path))
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, limit, count = _CACHE_HEADER.unpack_from(mm)
+        if magic != _CACHE_MAGIC or _CACHE_HEADER.size + count * 8 > size:
+            mm.close()
+            raise ValueError('{} is not a prime cache'.format(self.path))
+        self._mm = mm
+        self._limit = limit
+        self._table = memoryview(mm)[_CACHE_HEADER.size:_CACHE_HEADER.size + count * 8].cast('Q')
+
+    def _unmap(self):
+        """
+        Release the memory-mapped table
+        """
+        if self._mm is not None:
+            self._table.release()
+            self._mm.close()
+            self._mm = None
+
+    def extend(self, n):
+        """
+        Make sure that all primes up to n are in the table
+
+        :param n: the given number
+        :type n: int
+        """
+        if n <= self._limit:
+            return
+        limit = max(n, 2 * self._limit)
+        new_primes = array('Q', segmented_sieve(self._limit + 1, limit))
+        if self.path is None:
+            self._table.extend(new_primes)
+        else:
+            count = len(self._table)
+            mapped = self._mm is not None
+            self._unmap()
+            with open(self.path, 'r+b' if mapped else 'w+b') as f:
+                if not mapped:
+                    f.write(_CACHE_HEADER.pack(_CACHE_MAGIC, self._limit, count))
+                    f.write(self._table.tobytes())
+                # drop what an interrupted extension may have left
+                f.seek(_CACHE_HEADER.size + count * 8)
+                f.truncate()
+                f.write(new_primes.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+                f.seek(0)
+                f.write(_CACHE_HEADER.pack(_CACHE_MAGIC, limit, count + len(new_primes)))
+            self._map()
+        self._limit = limit
+
+    def nth_prime(self, k):
+        """
+        Get the k-th prime number, counting from nth_prime(1) = 2
+
+        :param k: index of prime, starting from 1
+        :type k: int
+        :return: the k-th prime number
+        :rtype: int
+        """
+        assert k >= 1
+        while len(self._table) < k:
+            # p_k < k (ln k + ln ln k) for k >= 6
+            self.extend(max(16, self._limit + 1,
+                            int(k * (math.log(k) + math.log(math.log(k + 2))))))
+        return self._table[k - 1]
+
+    def prime_pi(self, n):
+        """
+        Get number of prime numbers in the range of [0, n]
+
+        :param n: the given number
+        :type n: int
+        :return: number of prime numbers no more than n
+        :rtype: int
+        """
+        self.extend(n)
+        return binary_search_upper_bound(self._table, n) + 1
+
+    def primes_between(self, lb, ub):
+        """
+        Get prime numbers in the range of [lb, ub]
+
+        :param lb: lower bound of range
+        :type lb: int
+        :param ub: upper bound of range
+        :type ub: int
+        :return: prime numbers in the range of [lb, ub]
+        :rtype: list[int]
+        """
+        if ub < max(lb, 2):
+            return []
+        self.extend(ub)
+        return list(self._table[binary_search_lower_bound(self._table, lb):
+                                binary_search_upper_bound(self._table, ub) + 1])
+
+    def close(self):
+        self._unmap()
+
+    def __contains__(self, n):
+        self.extend(n)
+        idx = binary_search_lower_bound(self._table, n)
+        return 0 <= idx < len(self._table) and self._table[idx] == n
+
+    def __len__(self):
+        return len(self._table)
+
+
+# process-wide cache of prime numbers
+PRIME_CACHE = PrimeCache()
+
+
 class TestMathUtil(unittest.TestCase):
 
     def test_fast_pow_iterative(self):
         self.assertEqual(123 ** 10, fast_pow_iterative(123, 10))
 
+    def test_fast_pow_iterative_mod(self):
+        for _ in range(20):
+            x = random.randint(0, 10 ** 30)
+            n = random.randint(0, 10 ** 6)
+            mod = random.randint(1, 10 ** 20)
+            self.assertEqual(pow(x, n, mod), fast_pow_iterative(x, n, mod))
+
+    def test_mod_pow(self):
+        for _ in range(50):
+            x = random.randint(0, 10 ** 30)
+            n = random.randint(0, 2 ** random.randint(1, 600))
+            mod = random.randint(1, 10 ** 40)
+            self.assertEqual(pow(x, n, mod), mod_pow(x, n, mod))
+            self.assertEqual(pow(x, n, mod), mod_pow(x, n, mod, window=random.randint(1, 6)))
+
+    def test_fixed_base_pow(self):
+        mod = 2 ** 127 - 1
+        fixed_base = FixedBasePow(3, mod, window=5)
+        for n in [0, 1, 2, 31, 32, 33] + [random.randint(0, 2 ** 300) for _ in range(20)]:
+            self.assertEqual(pow(3, n, mod), fixed_base(n))
+        exponents = [random.randint(0, 10 ** 9) for _ in range(100)]
+        for mod in (1, 97, 10 ** 9 + 7, 2 ** 61 - 1):
+            self.assertListEqual([pow(5, n, mod) for n in exponents], pow_many(5, exponents, mod))
+
     def test_fast_pow_recursive(self):
         self.assertEqual(1234 ** 100, fast_pow_recursive(1234, 100))
         self.assertEqual(2 ** -3, fast_pow_recursive(2, -3))
         self.assertAlmostEqual(2.5 ** 10, fast_pow_recursive(2.5, 10))
 
+    def test_matpow(self):
+        fib = [[1, 1], [1, 0]]
+        self.assertListEqual([[1, 0], [0, 1]], matpow(fib, 0))
+        self.assertListEqual([[89, 55], [55, 34]], matpow(fib, 10))
+        self.assertListEqual([[89 % 7, 55 % 7], [55 % 7, 34 % 7]], matpow(fib, 10, 7))
+        matrix = [[random.randint(0, 100) for _ in range(3)] for _ in range(3)]
+        expected = [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+        for _ in range(13):
+            expected = _matmul(expected, matrix)
+        self.assertListEqual(expected, matpow(matrix, 13))
+        self.assertListEqual([[x % (10 ** 9 + 7) for x in row] for row in expected],
+                             matpow(matrix, 13, 10 ** 9 + 7))
+        self.assertListEqual([[x % (2 ** 61 - 1) for x in row] for row in expected],
+                             matpow(matrix, 13, 2 ** 61 - 1))
+
+    def test_linear_recurrence_nth(self):
+        fib = [0, 1]
+        for _ in range(200):
+            fib.append(fib[-1] + fib[-2])
+        for n in range(0, 200, 7):
+            self.assertEqual(fib[n], linear_recurrence_nth([1, 1], [0, 1], n))
+            self.assertEqual(fib[n], linear_recurrence_nth_kitamasa([1, 1], [0, 1], n))
+            self.assertEqual(fib[n] % 1000, linear_recurrence_nth([1, 1], [0, 1], n, 1000))
+            self.assertEqual(fib[n] % 1000, linear_recurrence_nth_kitamasa([1, 1], [0, 1], n, 1000))
+        # a[i] = 2a[i-1] - a[i-2] + 3a[i-3]
+        seq = [1, 4, 2]
+        for _ in range(50):
+            seq.append(2 * seq[-1] - seq[-2] + 3 * seq[-3])
+        for n in range(53):
+            self.assertEqual(seq[n], linear_recurrence_nth([2, -1, 3], [1, 4, 2], n))
+            self.assertEqual(seq[n], linear_recurrence_nth_kitamasa([2, -1, 3], [1, 4, 2], n))
+        self.assertEqual(3 ** 20, linear_recurrence_nth_kitamasa([3], [1], 20))
+        mod = 10 ** 9 + 7
+        self.assertEqual(linear_recurrence_nth([1, 1], [0, 1], 10 ** 18, mod),
+                         linear_recurrence_nth_kitamasa([1, 1], [0, 1], 10 ** 18, mod))
+
     def test_gcd(self):
         for _ in range(10):
             a = random.randint(0, 10000)
@@ -185,12 +1557,68 @@ class TestMathUtil(unittest.TestCase):
             b = random.randint(0, 10000)
             self.assertEqual(a * b / math.gcd(a, b), lcm(a, b))
 
+    def test_binary_gcd(self):
+        for _ in range(100):
+            a = random.randint(0, 10 ** 30)
+            b = random.randint(0, 10 ** 30)
+            self.assertEqual(math.gcd(a, b), binary_gcd(a, b))
+            g, x, y = ext_gcd(a, b)
+            self.assertEqual(math.gcd(a, b), g)
+            self.assertEqual(g, a * x + b * y)
+        self.assertEqual(0, binary_gcd(0, 0))
+        self.assertEqual(12, binary_gcd(-36, 24))
+        # consecutive Fibonacci numbers, the worst case of Euclid
+        fib = [0, 1]
+        for _ in range(3000):
+            fib.append(fib[-1] + fib[-2])
+        self.assertEqual(1, gcd(fib[-1], fib[-2]))
+
+    def test_mod_inverse(self):
+        mod = 10 ** 9 + 7
+        values = [random.randint(1, mod - 1) for _ in range(100)]
+        for value, inverse in zip(values, batch_mod_inverse(values, mod)):
+            self.assertEqual(pow(value, -1, mod), mod_inverse(value, mod))
+            self.assertEqual(1, value * inverse % mod)
+        self.assertListEqual([], batch_mod_inverse([], mod))
+        self.assertRaises(ValueError, mod_inverse, 6, 9)
+        self.assertRaises(ValueError, batch_mod_inverse, [2, 3, 4], 9)
+
+    def test_gcd_many(self):
+        self.assertEqual(6, gcd_many([12, 18, 30]))
+        self.assertEqual(0, gcd_many([]))
+        self.assertEqual(180, lcm_many([12, 18, 30]))
+        self.assertEqual(1, lcm_many([]))
+        self.assertEqual(0, lcm_many([3, 0]))
+        values = [random.randint(1, 10 ** 6) for _ in range(20)]
+        self.assertEqual(math.gcd(*values), gcd_many(values))
+        self.assertEqual(math.lcm(*values), lcm_many(values))
+
     def test_is_prime(self):
         self.assertFalse(is_prime(0))
         self.assertFalse(is_prime(1))
         self.assertFalse(is_prime(10))
         self.assertTrue(is_prime(2))
         self.assertTrue(is_prime(3))
+        self.assertFalse(is_prime(4))
+        self.assertFalse(is_prime(9))
+        self.assertFalse(is_prime(25))
+
+    def test_is_prime_miller_rabin(self):
+        self.assertListEqual([is_prime(i) for i in range(10000)],
+                             is_prime_many(range(10000)))
+        # strong pseudoprimes to small bases and Carmichael numbers
+        for n in (561, 1105, 2047, 3215031751, 3825123056546413051,
+                  318665857834031151167461, (2 ** 61 - 1) * (2 ** 89 - 1),
+                  1000003 * 1000033):
+            self.assertFalse(is_prime_miller_rabin(n))
+            self.assertFalse(baillie_psw(n))
+        for n in (1000003, 2 ** 31 - 1, 2 ** 61 - 1, 2 ** 64 - 59,
+                  2 ** 89 - 1, 2 ** 127 - 1, 2 ** 521 - 1):
+            self.assertTrue(is_prime_miller_rabin(n))
+            self.assertTrue(baillie_psw(n))
+        self.assertFalse(baillie_psw(1000003 ** 2))
+        self.assertListEqual([is_prime(i) for i in range(2000)],
+                             [baillie_psw(i) for i in range(2000)])
 
     def test_sieve(self):
         self.assertListEqual([2, 3, 5, 7, 11, 13, 17, 19], sieve(20))
@@ -198,6 +1626,147 @@ class TestMathUtil(unittest.TestCase):
     def test_sieve_range(self):
         self.assertListEqual([11, 13, 17, 19], sieve_range(10, 20))
 
+    def test_parallel_sieve(self):
+        for lb, ub in ((0, 200000), (10 ** 12, 10 ** 12 + 100000), (5, 5), (0, 1)):
+            prime_list = list(segmented_sieve(lb, ub))
+            self.assertListEqual(prime_list, list(parallel_sieve(lb, ub, workers=2, segment_size=30011)))
+            counts = parallel_sieve(lb, ub, workers=2, count_only=True)
+            self.assertEqual(len(prime_list), sum(count for _, _, count in counts))
+        # neither an unconsumed nor a partially consumed stream leaves
+        # shared memory behind
+        shm_dir = '/dev/shm'
+        if os.path.isdir(shm_dir):
+            before = set(os.listdir(shm_dir))
+            stream = parallel_sieve(0, 10 ** 6, workers=2)
+            del stream
+            stream = parallel_sieve(0, 10 ** 6, workers=2)
+            self.assertEqual(2, next(stream))
+            stream.close()
+            self.assertSetEqual(before, set(os.listdir(shm_dir)))
+        # segments are submitted as the stream is consumed
+        stream = parallel_sieve(0, 10 ** 12, workers=2)
+        self.assertListEqual([2, 3, 5, 7, 11], [next(stream) for _ in range(5)])
+        stream.close()
+        counts = parallel_sieve(0, 5 * 10 ** 6, workers=2, count_only=True)
+        self.assertEqual(3, len(counts))
+        self.assertEqual(348513, sum(count for _, _, count in counts))
+
+    def test_factorize(self):
+        # a larger table built before must not bypass Pollard-Brent below
+        factorize(2, table_bound=1 << 20)
+        for n in list(range(1, 2000)) + [random.randint(1, 10 ** 12) for _ in range(20)]:
+            factors = factorize(n, table_bound=1000)
+            self.assertEqual(n, math.prod(p ** e for p, e in factors.items()))
+            self.assertTrue(all(is_prime_miller_rabin(p) for p in factors))
+            self.assertListEqual(sorted(factors), list(factors))
+        self.assertDictEqual({1000003: 2, 2 ** 89 - 1: 1},
+                             factorize(1000003 ** 2 * (2 ** 89 - 1)))
+        self.assertDictEqual({10 ** 9 + 7: 2, 10 ** 9 + 9: 1},
+                             factorize((10 ** 9 + 7) ** 2 * (10 ** 9 + 9)))
+        self.assertDictEqual({3: 1, 1000003: 1, 1000033: 1},
+                             factorize(3 * 1000003 * 1000033))
+        self.assertDictEqual({}, factorize(1))
+        self.assertListEqual([1, 1, 2, 2, 4, 2, 6, 4, 6, 4], [totient(n) for n in range(1, 11)])
+        self.assertListEqual([1, 2, 2, 3, 2, 4, 2, 4, 3, 4], [divisor_count(n) for n in range(1, 11)])
+
+    def test_factorize_range(self):
+        for lo, hi in ((1, 500), (10 ** 12, 10 ** 12 + 200)):
+            self.assertListEqual([factorize(n) for n in range(lo, hi + 1)],
+                                 factorize_range(lo, hi))
+        table = smallest_prime_factors(100)
+        self.assertListEqual([0, 1, 2, 3, 2, 5, 2, 7, 2, 3, 2], list(table[:11]))
+        self.assertEqual(7, table[91])
+
+    def test_prime_count(self):
+        for n in list(range(0, 200)) + [random.randint(200, 10 ** 6) for _ in range(5)]:
+            prime_list = list(segmented_sieve(0, n))
+            self.assertEqual(len(prime_list), prime_count(n))
+            self.assertEqual(sum(prime_list), prime_sum(n))
+        self.assertEqual(50847534, prime_count(10 ** 9))
+        self.assertEqual(37550402023, prime_sum(10 ** 6))
+        # the intermediate sums exceed int64 beyond n = 2^32
+        self.assertEqual(2220822432581729238, prime_sum(10 ** 10))
+        if np is not None:
+            n = random.randint(10 ** 6, 10 ** 7)
+            for mod in _LUCY_MODULI:
+                self.assertEqual(prime_sum(n) % mod, _lucy_hedgehog_numpy(n, 1, mod))
+
+    def test_primes(self):
+        gen = primes()
+        self.assertListEqual(list(segmented_sieve(0, 200000)),
+                             [next(gen) for _ in range(17984)])
+
+    def test_prime_cache(self):
+        cache = PrimeCache()
+        self.assertEqual(2, cache.nth_prime(1))
+        self.assertEqual(7919, cache.nth_prime(1000))
+        self.assertEqual(0, cache.prime_pi(1))
+        self.assertEqual(4, cache.prime_pi(10))
+        self.assertEqual(78498, cache.prime_pi(10 ** 6))
+        self.assertListEqual([11, 13, 17, 19], cache.primes_between(10, 20))
+        self.assertListEqual([], cache.primes_between(24, 28))
+        self.assertIn(999983, cache)
+        self.assertNotIn(999981, cache)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'primes.bin')
+            cache = PrimeCache(path)
+            self.assertEqual(104729, cache.nth_prime(10000))
+            cache.extend(300000)
+            cache.close()
+            # reload the persisted table
+            cache = PrimeCache(path)
+            self.assertGreaterEqual(len(cache), 25997)
+            self.assertEqual(25997, cache.prime_pi(300000))
+            self.assertEqual(1000003, cache.primes_between(10 ** 6, 10 ** 6 + 10)[0])
+            self.assertEqual(78498, cache.prime_pi(10 ** 6))
+            cache.close()
+            # an extension interrupted before updating the header
+            with open(path, 'ab') as f:
+                f.write(array('Q', segmented_sieve(2, 10 ** 5)).tobytes())
+            cache = PrimeCache(path)
+            self.assertEqual(62, cache.prime_pi(300))
+            cache.extend(5 * 10 ** 6)
+            self.assertEqual(348513, cache.prime_pi(5 * 10 ** 6))
+            self.assertListEqual(list(segmented_sieve(0, 5 * 10 ** 6)), list(cache._table))
+            cache.close()
+            # other files are left untouched
+            for content in (b'user data\n', b'user data which is longer than a header\n'):
+                path = os.path.join(tmp_dir, 'data.txt')
+                with open(path, 'wb') as f:
+                    f.write(content)
+                with self.assertRaises(ValueError):
+                    PrimeCache(path)
+                with open(path, 'rb') as f:
+                    self.assertEqual(content, f.read())
+            # an empty file is no cache
+            path = os.path.join(tmp_dir, 'empty.bin')
+            open(path, 'wb').close()
+            cache = PrimeCache(path)
+            self.assertEqual(0, len(cache))
+            self.assertEqual(25, cache.prime_pi(100))
+            cache.close()
+            cache = PrimeCache(path)
+            self.assertEqual(25, cache.prime_pi(100))
+            cache.close()
+
+    def test_segmented_sieve(self):
+        def trial_division(n):
+            return n > 1 and all(n % i for i in range(2, math.isqrt(n) + 1))
+
+        self.assertListEqual([2, 3, 5, 7, 11, 13, 17, 19], list(segmented_sieve(0, 20)))
+        self.assertListEqual([11, 13, 17, 19], list(segmented_sieve(10, 20)))
+        self.assertListEqual([], list(segmented_sieve(0, 1)))
+        self.assertListEqual([2], list(segmented_sieve(2, 2)))
+        for _ in range(10):
+            lb = random.randint(0, 5000)
+            ub = lb + random.randint(0, 3000)
+            self.assertListEqual([i for i in range(lb, ub + 1) if trial_division(i)],
+                                 list(segmented_sieve(lb, ub, segment_size=64)))
+        # window near 10^12
+        lb = 10 ** 12 - 50
+        self.assertListEqual([i for i in range(lb, lb + 100) if trial_division(i)],
+                             list(segmented_sieve(lb, lb + 99)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -22,13 +22,74 @@ to write an efficient function to randomly select k numbers where 1 <= k <= n.
 Let the input array be stream[].
 
 - https://www.geeksforgeeks.org/reservoir-sampling/
+
+Weighted Reservoir Sampling
+---
+Each item of the stream comes with a positive weight, and the sample of k
+items is drawn as if items were picked one by one without replacement with
+probability proportional to their weights.
+
+- https://en.wikipedia.org/wiki/Reservoir_sampling#Weighted_random_sampling
 """
 
 import unittest
+import math
 import random
+from collections import Counter
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from basics_data_structure.heap import MinHeap
+
+
+def _is_numpy_generator(rng):
+    """
+    Check whether the random generator is a numpy.random.Generator
+
+    :param rng: random generator
+    :type rng: random.Random or numpy.random.Generator
+    :return: whether rng is a numpy.random.Generator
+    :rtype: bool
+    """
+    return np is not None and isinstance(rng, np.random.Generator)
+
+
+def _uniform_open(rng):
+    """
+    Draw a random float uniformly in the open interval (0, 1)
+
+    :param rng: random generator
+    :type rng: random.Random or numpy.random.Generator
+    :return: random float in (0, 1)
+    :rtype: float
+    """
+    u = rng.random()
+    while u == 0.0:
+        u = rng.random()
+    return u
+
+
+def _randrange(rng, n):
+    """
+    Draw a random integer uniformly in [0, n)
+
+    :param rng: random generator
+    :type rng: random.Random or numpy.random.Generator
+    :param n: exclusive upper bound
+    :type n: int
+    :return: random integer in [0, n)
+    :rtype: int
+    """
+    if _is_numpy_generator(rng):
+        return int(rng.integers(n))
+    return rng.randrange(n)
 
 
-def shuffle(array):
+def shuffle(array, rng=None):
     """
     Generate a random permutation of the input array by Fisher–Yates
     shuffle algorithm
@@ -38,24 +99,60 @@ def shuffle(array):
     the array from 0 to n-2 (size reduced by 1), and repeat the process
     till we hit the first element.
 
+    With a numpy.random.Generator, all the random indices are drawn in one
+    vectorized call before swapping, instead of one call per element.
+
     Time Complexity: O(n), assuming that the function rand() takes O(1) time.
 
     :param array: input array
     :type array: list
+    :param rng: random generator, pass a seeded one for reproducible
+                results, the global one of module random by default
+    :type rng: random.Random or numpy.random.Generator
     :return: shuffled array
     :rtype: list
     """
+    if rng is None:
+        rng = random
+    n = len(array)
+    if _is_numpy_generator(rng):
+        # rand_list[j] is uniform in [0, n - j - 1], i.e. [0, i] for i = n - 1 - j
+        rand_list = rng.integers(0, np.arange(n, 1, -1)).tolist() if n > 1 else []
+    else:
+        rand_list = (rng.randrange(i + 1) for i in range(n - 1, 0, -1))
     # start from the last element and swap one by one. We don't
     # need to run for the first element that's why i > 0
-    for i in range(len(array) - 1, 0, -1):
-        # pick a random index from 0 to i
-        rand = random.randint(0, i + 1)
-        # swap array[i] with the element at random index
+    for i, rand in zip(range(n - 1, 0, -1), rand_list):
+        # swap array[i] with the element at random index from 0 to i
         array[i], array[rand] = array[rand], array[i]
     return array
 
 
-def reservoir_sample(array, n, k):
+def permutations_batch(n, k, rng=None):
+    """
+    Generate k independent random permutations of 0, 1, ..., n-1
+
+    With numpy, the k rows are shuffled at once by
+    numpy.random.Generator.permuted.
+
+    :param n: length of each permutation
+    :type n: int
+    :param k: number of permutations
+    :type k: int
+    :param rng: random generator, numpy.random.default_rng() by default if
+                numpy is installed, otherwise the module random
+    :type rng: random.Random or numpy.random.Generator
+    :return: k permutations, as an array of shape (k, n) with numpy
+    :rtype: list[list[int]] or numpy.ndarray
+    """
+    if rng is None:
+        rng = random if np is None else np.random.default_rng()
+    if _is_numpy_generator(rng):
+        return rng.permuted(np.broadcast_to(np.arange(n), (k, n)), axis=1)
+    return [shuffle(list(range(n)), rng) for _ in range(k)]
+
+
+def reservoir_sample(array, n, k, rng=None):
     """
     A function to randomly select k items from array[0..n-1].
 
@@ -77,30 +174,273 @@ def reservoir_sample(array, n, k):
     :type n: int
     :param k: number of elements to sample
     :type k: int
+    :param rng: random generator, the global one of module random by default
+    :type rng: random.Random or numpy.random.Generator
     :return: sampled array
     :rtype: list
     """
+    if rng is None:
+        rng = random
     reservior = array[:k]
     idx = k
     while idx < n:
-        rand = random.randint(0, idx + 1)
+        # random number from 0 to idx
+        rand = _randrange(rng, idx + 1)
         if rand < k:
             reservior[rand] = array[idx]
         idx += 1
     return reservior
 
 
+def reservoir_sample_stream(iterable, k, rng=None):
+    """
+    Randomly select k items from an iterable of unknown length by Vitter's
+    Algorithm L
+
+    Let w be the largest of k + i uniform random keys drawn after i
+    replacements, w is distributed as u^(1/k) times the previous w. Instead
+    of drawing a random number for each item, the number of items to skip
+    until the next replacement is geometric with success probability w,
+    i.e. floor(log(u) / log(1 - w)), and these items are skipped by
+    itertools.islice without being looked at. w is kept in log space for
+    precision.
+
+    - Time Complexity: O(n) to consume the iterable, with
+      O(k(1 + log(n/k))) random numbers
+    - Space Complexity: O(k)
+
+    - https://dl.acm.org/doi/10.1145/198429.198435
+
+    :param iterable: items to sample from
+    :type iterable: Iterable
+    :param k: number of items to sample
+    :type k: int
+    :param rng: random generator, the global one of module random by default
+    :type rng: random.Random or numpy.random.Generator
+    :return: sampled items, all items if there are no more than k of them
+    :rtype: list
+    """
+    if rng is None:
+        rng = random
+    iterator = iter(iterable)
+    reservoir = list(islice(iterator, k))
+    if len(reservoir) < k or k == 0:
+        return reservoir
+    sentinel = object()
+    log_w = math.log(_uniform_open(rng)) / k
+    while True:
+        # log(1 - w) = log(-expm1(log(w)))
+        skip = int(math.log(_uniform_open(rng)) / math.log(-math.expm1(log_w)))
+        item = next(islice(iterator, skip, None), sentinel)
+        if item is sentinel:
+            return reservoir
+        reservoir[_randrange(rng, k)] = item
+        log_w += math.log(_uniform_open(rng)) / k
+
+
+def _weighted_items(iterable):
+    """
+    Iterate over (item, weight) pairs with positive weight
+
+    :param iterable: (item, weight) pairs
+    :type iterable: Iterable[tuple[Any, float]]
+    :return: (item, weight) pairs with zero weight ones dropped
+    :rtype: Iterator[tuple[Any, float]]
+    """
+    for item, weight in iterable:
+        if weight < 0:
+            raise ValueError('negative weight {} of item {!r}'.format(weight, item))
+        if weight > 0:
+            yield item, weight
+
+
+def weighted_reservoir_sample(iterable, k, rng=None):
+    """
+    Randomly select k items from a stream of (item, weight) pairs by the
+    A-Res algorithm of Efraimidis and Spirakis
+
+    Each item is given the key u^(1/w), where u is uniform in (0, 1) and w
+    is its weight, and the k items with the largest keys are the sample.
+    They are kept in a MinHeap, so a new item only needs to beat the
+    root. The keys are compared as log(u) / w, which is of the same order
+    but does not underflow for small weights.
+
+    - Time Complexity: O(n log k)
+    - Space Complexity: O(k)
+
+    - https://doi.org/10.1016/j.ipl.2005.11.003
+
+    :param iterable: (item, weight) pairs, weights are non-negative and
+                     items of zero weight are never selected
+    :type iterable: Iterable[tuple[Any, float]]
+    :param k: number of items to sample
+    :type k: int
+    :param rng: random generator, the global one of module random by default
+    :type rng: random.Random or numpy.random.Generator
+    :return: sampled items, all items if there are no more than k of them
+    :rtype: list
+    """
+    if rng is None:
+        rng = random
+    # heap of (key, sequence number, item), the sequence number breaks ties
+    # so that items are never compared
+    heap = MinHeap()
+    for seq, (item, weight) in enumerate(_weighted_items(iterable)):
+        key = math.log(_uniform_open(rng)) / weight
+        if len(heap) < k:
+            heap.push((key, seq, item))
+        elif k > 0 and key > heap.peek()[0]:
+            heap.pop()
+            heap.push((key, seq, item))
+    return [heap.pop()[2] for _ in range(len(heap))]
+
+
+def weighted_reservoir_sample_exp_jumps(iterable, k, rng=None):
+    """
+    Randomly select k items from a stream of (item, weight) pairs by the
+    A-ExpJ algorithm of Efraimidis and Spirakis
+
+    It keeps the same sample as A-Res, but instead of drawing a key for
+    every item, it draws how much weight to skip until the next item that
+    enters the reservoir. With the smallest key T in the reservoir, that
+    is X = log(u) / log(T). The item where the accumulated weight reaches X
+    replaces the root, with a key u^(1/w) for u uniform in (T^w, 1).
+
+    - Time Complexity: O(n + k log k log(n/k))
+    - Space Complexity: O(k)
+
+    - https://doi.org/10.1016/j.ipl.2005.11.003
+
+    :param iterable: (item, weight) pairs, weights are non-negative and
+                     items of zero weight are never selected
+    :type iterable: Iterable[tuple[Any, float]]
+    :param k: number of items to sample
+    :type k: int
+    :param rng: random generator, the global one of module random by default
+    :type rng: random.Random or numpy.random.Generator
+    :return: sampled items, all items if there are no more than k of them
+    :rtype: list
+    """
+    if rng is None:
+        rng = random
+    iterator = _weighted_items(iterable)
+    heap = MinHeap()
+    for seq, (item, weight) in enumerate(islice(iterator, k)):
+        heap.push((math.log(_uniform_open(rng)) / weight, seq, item))
+    if len(heap) < k or k == 0:
+        return [heap.pop()[2] for _ in range(len(heap))]
+    # log of the smallest key and weight to skip
+    log_t = heap.peek()[0]
+    jump = math.log(_uniform_open(rng)) / log_t
+    for seq, (item, weight) in enumerate(iterator, k):
+        jump -= weight
+        if jump > 0:
+            continue
+        # key is u^(1/w) for u uniform in (T^w, 1)
+        t_w = math.exp(weight * log_t)
+        u = t_w + (1 - t_w) * _uniform_open(rng)
+        heap.pop()
+        heap.push((math.log(u) / weight, seq, item))
+        log_t = heap.peek()[0]
+        jump = math.log(_uniform_open(rng)) / log_t
+    return [heap.pop()[2] for _ in range(len(heap))]
+
+
 class TestShuffle(unittest.TestCase):
     def test_shuffle(self):
         length = 10
         val_list = [i for i in range(length)]
         print('Shuffled array: ', shuffle(val_list))
+        self.assertListEqual(list(range(length)), sorted(val_list))
+        self.assertListEqual(shuffle(list(range(100)), random.Random(7)),
+                             shuffle(list(range(100)), random.Random(7)))
+        self.assertListEqual([], shuffle([]))
+        self.assertListEqual([1], shuffle([1]))
+
+    def _assert_uniform(self, perms, n):
+        # every permutation of n = 3 elements is expected 1/6 of the time
+        counter = Counter(map(tuple, perms))
+        self.assertEqual(6, len(counter))
+        for count in counter.values():
+            self.assertLess(abs(count - len(perms) / 6), 5 * (len(perms) * 5 / 36) ** 0.5)
+        self.assertSetEqual({tuple(range(n))}, {tuple(sorted(perm)) for perm in counter})
+
+    def test_shuffle_uniform(self):
+        rng = random.Random(2024)
+        self._assert_uniform([shuffle([0, 1, 2], rng) for _ in range(6000)], 3)
+        self._assert_uniform(permutations_batch(3, 6000, random.Random(1)), 3)
+        if np is not None:
+            rng = np.random.default_rng(2024)
+            self._assert_uniform([shuffle([0, 1, 2], rng) for _ in range(6000)], 3)
+            perms = permutations_batch(3, 6000, np.random.default_rng(1))
+            self.assertTupleEqual((6000, 3), perms.shape)
+            self._assert_uniform(perms.tolist(), 3)
+            self.assertListEqual(shuffle(list(range(100)), np.random.default_rng(7)),
+                                 shuffle(list(range(100)), np.random.default_rng(7)))
 
     def test_sample(self):
         length = 20
         val_list = [i for i in range(length)]
         print('Sampled array: ', reservoir_sample(val_list, 20, 10))
 
+    def _assert_inclusion(self, samples, n, k):
+        # every item is expected to be sampled with probability k / n
+        counter = Counter(item for sample in samples for item in sample)
+        self.assertSetEqual(set(range(n)), set(counter))
+        expected = len(samples) * k / n
+        for count in counter.values():
+            self.assertLess(abs(count - expected), 5 * (expected * (1 - k / n)) ** 0.5)
+
+    def test_sample_uniform(self):
+        rng = random.Random(2024)
+        samples = [reservoir_sample(list(range(10)), 10, 3, rng) for _ in range(5000)]
+        self._assert_inclusion(samples, 10, 3)
+        samples = [reservoir_sample_stream(iter(range(30)), 4, rng) for _ in range(5000)]
+        self.assertTrue(all(len(set(sample)) == 4 for sample in samples))
+        self._assert_inclusion(samples, 30, 4)
+        if np is not None:
+            rng = np.random.default_rng(2024)
+            samples = [reservoir_sample_stream(range(30), 4, rng) for _ in range(5000)]
+            self._assert_inclusion(samples, 30, 4)
+
+    def test_sample_stream(self):
+        self.assertListEqual([0, 1, 2], reservoir_sample_stream(range(3), 5))
+        self.assertListEqual([], reservoir_sample_stream(range(3), 0))
+        self.assertListEqual([], reservoir_sample_stream([], 3))
+        sample = reservoir_sample_stream(range(10 ** 7), 10, random.Random(1))
+        self.assertEqual(10, len(set(sample)))
+        self.assertListEqual(sample, reservoir_sample_stream(range(10 ** 7), 10, random.Random(1)))
+
+    def test_weighted_sample(self):
+        weights = [1, 2, 3, 4, 0]
+        total = sum(weights)
+        # probability of being picked in one of two draws without replacement
+        expected = [w / total + sum(v / total * w / (total - v)
+                                    for j, v in enumerate(weights) if j != i)
+                    for i, w in enumerate(weights)]
+        rng = random.Random(2024)
+        trials = 8000
+        for sample_func in (weighted_reservoir_sample, weighted_reservoir_sample_exp_jumps):
+            samples = [sample_func(enumerate(weights), 2, rng) for _ in range(trials)]
+            self.assertTrue(all(len(set(sample)) == 2 for sample in samples))
+            counter = Counter(item for sample in samples for item in sample)
+            self.assertNotIn(4, counter)
+            for i, p in enumerate(expected):
+                self.assertLess(abs(counter[i] - trials * p), 5 * (trials * p * (1 - p)) ** 0.5 + 1)
+            self.assertCountEqual([0, 1], sample_func([(0, 1), (1, 2), (2, 0)], 3))
+            self.assertListEqual([], sample_func(enumerate(weights), 0))
+            with self.assertRaises(ValueError):
+                sample_func([(0, 1), (1, -1)], 1)
+
+    def test_weighted_sample_stream(self):
+        stream = ((i, 1 + i % 7) for i in range(10 ** 5))
+        sample = weighted_reservoir_sample_exp_jumps(stream, 20, random.Random(1))
+        self.assertEqual(20, len(set(sample)))
+        if np is not None:
+            sample = weighted_reservoir_sample(((i, 0.5) for i in range(1000)), 5,
+                                               np.random.default_rng(1))
+            self.assertEqual(5, len(set(sample)))
+
 
 if __name__ == '__main__':
     unittest.main()
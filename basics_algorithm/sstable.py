@@ -0,0 +1,320 @@
+"""
+Sorted String Table
+
+An SSTable is an immutable file of key/value pairs sorted by key. Entries
+are packed into blocks of about the same size which are compressed
+separately, and the first key of every block is kept in a sparse index at
+the end of file, followed by a fixed-size footer.
+
+File layout::
+
+    [block 0] [block 1] ... [block n-1] [index] [footer]
+
+- block: zlib compressed entries, each entry is
+  (key length, value length, key, value)
+- index: for each block, (offset, length, first key length, first key)
+- footer: (index offset, index length, number of entries, magic)
+
+A lookup is one binary search over the in-memory index and one block read,
+and recently used blocks are kept in a LRU cache.
+
+- https://www.igvita.com/2012/02/06/sstable-and-log-structured-storage-leveldb/
+"""
+
+import unittest
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+from collections import OrderedDict
+from random import randrange
+
+from .binary_search import binary_search_lower_bound, binary_search_upper_bound
+
+_ENTRY_HEADER = struct.Struct('>II')
+_INDEX_HEADER = struct.Struct('>QII')
+_FOOTER = struct.Struct('>QQQ4s')
+_MAGIC = b'SST1'
+
+
+class SSTableWriter:
+
+    def __init__(self, path, block_size=4096, compress_level=6) -> None:
+        """
+        Writer of SSTable, entries must be added in ascending order of key
+
+        :param path: path of file to write
+        :type path: str
+        :param block_size: size of uncompressed block in bytes
+        :type block_size: int
+        :param compress_level: zlib compression level
+        :type compress_level: int
+        """
+        super().__init__()
+        self.block_size = block_size
+        self.compress_level = compress_level
+        self._file = open(path, 'wb')
+        self._block = []
+        self._block_bytes = 0
+        self._index = []
+        self._last_key = None
+        self._num_entries = 0
+
+    def add(self, key, value):
+        """
+        Append an entry to the table
+
+        :param key: key of entry, greater than the last added key
+        :type key: bytes
+        :param value: value of entry
+        :type value: bytes
+        """
+        assert self._last_key is None or key > self._last_key
+        self._block.append(_ENTRY_HEADER.pack(len(key), len(value)) + key + value)
+        if len(self._block) == 1:
+            self._index.append([key, 0, 0])
+        self._block_bytes += len(self._block[-1])
+        self._last_key = key
+        self._num_entries += 1
+        if self._block_bytes >= self.block_size:
+            self._flush_block()
+
+    def _flush_block(self):
+        """
+        Compress and write the current block
+        """
+        if len(self._block) == 0:
+            return
+        data = zlib.compress(b''.join(self._block), self.compress_level)
+        self._index[-1][1] = self._file.tell()
+        self._index[-1][2] = len(data)
+        self._file.write(data)
+        self._block = []
+        self._block_bytes = 0
+
+    def close(self):
+        """
+        Write the last block, the index and the footer
+        """
+        if self._file.closed:
+            return
+        self._flush_block()
+        index_offset = self._file.tell()
+        for first_key, offset, length in self._index:
+            self._file.write(_INDEX_HEADER.pack(offset, length, len(first_key)))
+            self._file.write(first_key)
+        index_length = self._file.tell() - index_offset
+        self._file.write(_FOOTER.pack(index_offset, index_length,
+                                      self._num_entries, _MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SSTableReader:
+
+    def __init__(self, path, cache_blocks=64) -> None:
+        """
+        Reader of SSTable
+
+        Only the footer and the sparse index are loaded when opening,
+        blocks are read on demand.
+
+        :param path: path of file to read
+        :type path: str
+        :param cache_blocks: number of decoded blocks to keep in LRU cache
+        :type cache_blocks: int
+        """
+        super().__init__()
+        self.cache_blocks = cache_blocks
+        self._cache = OrderedDict()
+        self._file = open(path, 'rb')
+        self._file.seek(-_FOOTER.size, os.SEEK_END)
+        index_offset, index_length, self._num_entries, magic = \
+            _FOOTER.unpack(self._file.read(_FOOTER.size))
+        assert magic == _MAGIC
+        self._file.seek(index_offset)
+        index = self._file.read(index_length)
+        self._first_keys = []
+        self._offsets = array('q')
+        self._lengths = array('q')
+        pos = 0
+        while pos < len(index):
+            offset, length, key_length = _INDEX_HEADER.unpack_from(index, pos)
+            pos += _INDEX_HEADER.size
+            self._first_keys.append(index[pos:pos + key_length])
+            self._offsets.append(offset)
+            self._lengths.append(length)
+            pos += key_length
+
+    def _read_block(self, block_idx):
+        """
+        Read and decode a block from file
+
+        :param block_idx: index of block
+        :type block_idx: int
+        :return: keys and values in the block
+        :rtype: tuple[list[bytes], list[bytes]]
+        """
+        self._file.seek(self._offsets[block_idx])
+        data = zlib.decompress(self._file.read(self._lengths[block_idx]))
+        keys = []
+        values = []
+        pos = 0
+        while pos < len(data):
+            key_length, value_length = _ENTRY_HEADER.unpack_from(data, pos)
+            pos += _ENTRY_HEADER.size
+            keys.append(data[pos:pos + key_length])
+            pos += key_length
+            values.append(data[pos:pos + value_length])
+            pos += value_length
+        return keys, values
+
+    def _get_block(self, block_idx):
+        """
+        Get a decoded block through the LRU cache
+
+        :param block_idx: index of block
+        :type block_idx: int
+        :return: keys and values in the block
+        :rtype: tuple[list[bytes], list[bytes]]
+        """
+        if block_idx in self._cache:
+            self._cache.move_to_end(block_idx)
+            return self._cache[block_idx]
+        block = self._read_block(block_idx)
+        self._cache[block_idx] = block
+        if len(self._cache) > self.cache_blocks:
+            self._cache.popitem(last=False)
+        return block
+
+    def get(self, key, default=None):
+        """
+        Get value of given key
+
+        :param key: key to search
+        :type key: bytes
+        :param default: value to return if key is not found
+        :type default: Any
+        :return: value of key
+        :rtype: bytes
+        """
+        # the only block which may contain key
+        block_idx = binary_search_upper_bound(self._first_keys, key)
+        if block_idx < 0:
+            return default
+        keys, values = self._get_block(block_idx)
+        idx = binary_search_lower_bound(keys, key)
+        if idx < len(keys) and keys[idx] == key:
+            return values[idx]
+        return default
+
+    def scan(self, start=None, stop=None):
+        """
+        Iterate over entries with start <= key < stop in ascending order
+
+        Blocks are read one by one without going through the cache, so a
+        long scan does not evict the blocks of point lookups.
+
+        :param start: inclusive lower bound of key, None for unbounded
+        :type start: bytes
+        :param stop: exclusive upper bound of key, None for unbounded
+        :type stop: bytes
+        :return: key and value of each entry
+        :rtype: Iterator[tuple[bytes, bytes]]
+        """
+        block_idx = 0
+        if start is not None:
+            block_idx = max(binary_search_upper_bound(self._first_keys, start), 0)
+        for block_idx in range(block_idx, len(self._first_keys)):
+            if stop is not None and self._first_keys[block_idx] >= stop:
+                return
+            keys, values = self._read_block(block_idx)
+            idx = 0 if start is None else binary_search_lower_bound(keys, start)
+            for idx in range(idx, len(keys)):
+                if stop is not None and keys[idx] >= stop:
+                    return
+                yield keys[idx], values[idx]
+
+    @property
+    def num_blocks(self):
+        return len(self._first_keys)
+
+    def close(self):
+        self._file.close()
+        self._cache.clear()
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        return (key for key, _ in self.scan())
+
+    def __len__(self):
+        return self._num_entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TestSSTable(unittest.TestCase):
+
+    def test_get(self):
+        entries = {'{:08d}'.format(randrange(0, 10 ** 6)).encode(): str(i).encode() * (i % 5)
+                   for i in range(2000)}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'table.sst')
+            with SSTableWriter(path, block_size=512) as writer:
+                for key in sorted(entries):
+                    writer.add(key, entries[key])
+            with SSTableReader(path, cache_blocks=4) as reader:
+                self.assertEqual(len(entries), len(reader))
+                self.assertGreater(reader.num_blocks, 1)
+                for key, value in entries.items():
+                    self.assertEqual(value, reader[key])
+                self.assertIsNone(reader.get(b''))
+                self.assertIsNone(reader.get(b'99999999x'))
+                self.assertNotIn(b'0000000', reader)
+                self.assertLessEqual(len(reader._cache), 4)
+
+    def test_scan(self):
+        keys = sorted({'{:06d}'.format(randrange(0, 10 ** 4)).encode() for _ in range(1000)})
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'table.sst')
+            with SSTableWriter(path, block_size=256) as writer:
+                for key in keys:
+                    writer.add(key, key[::-1])
+            with SSTableReader(path) as reader:
+                self.assertListEqual(keys, list(reader))
+                for start, stop in ((b'001000', b'005000'), (b'', b'000100'),
+                                    (b'009000', None), (None, b'002000')):
+                    expected = [(key, key[::-1]) for key in keys
+                                if (start is None or key >= start) and (stop is None or key < stop)]
+                    self.assertListEqual(expected, list(reader.scan(start, stop)))
+
+    def test_empty(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'table.sst')
+            SSTableWriter(path).close()
+            with SSTableReader(path) as reader:
+                self.assertEqual(0, len(reader))
+                self.assertIsNone(reader.get(b'a'))
+                self.assertListEqual([], list(reader.scan()))
+
+
+if __name__ == '__main__':
+    unittest.main()
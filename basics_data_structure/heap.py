@@ -135,6 +135,15 @@ class MaxHeap:
         self._sink(0)
         return node
 
+    def peek(self):
+        """
+        Get the root node without popping it
+
+        :return: the root node from heap
+        :rtype: Any
+        """
+        return self._heap[0]
+
     def __len__(self):
         return len(self._heap)
 
@@ -167,6 +176,7 @@ class TestHeap(unittest.TestCase):
         val_list = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
         heap = MinHeap(val_list[:])
         size = len(heap)
+        self.assertEqual(0, heap.peek())
         # test pop
         pop_list = [heap.pop() for _ in range(size)]
         self.assertListEqual(sorted(val_list), pop_list)